@@ -0,0 +1,96 @@
+"""Generate synthetic portfolio data for benchmarks
+
+Writes a portfolio_data directory in the original JSON layout, with photos
+named by record id, so the app imports it on first start like real data.
+
+    python benchmarks/portfolio_generator.py /tmp/portfolio --records 1000 --photos 20
+"""
+import argparse
+import io
+import json
+import random
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+from PIL import Image
+
+WORDS = (
+    "neural network vision model data pipeline agent graph search compiler "
+    "tensor stream cache index parser kernel robot sensor map planner tracker"
+).split()
+TECHNOLOGIES = ["Python", "PyTorch", "TensorFlow", "Rust", "Go", "SQL", "Streamlit", "C++", "CUDA", "JAX"]
+
+def _title(rng, index):
+    return f"{' '.join(rng.choice(WORDS).capitalize() for _ in range(3))} {index}"
+
+def _description(rng):
+    """A few Markdown paragraphs with the formatting the editor produces"""
+    lines = []
+    for _ in range(rng.randint(1, 3)):
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 40))) + ".")
+    lines.append(f"- **{rng.choice(WORDS)}** {rng.choice(WORDS)}\n- *{rng.choice(WORDS)}* {rng.choice(WORDS)}")
+    return "\n\n".join(lines)
+
+def _date(rng):
+    return (date(2015, 1, 1) + timedelta(days=rng.randint(0, 3650))).strftime('%Y-%m-%d')
+
+def _project(rng, index):
+    return {
+        "id": uuid.UUID(int=rng.getrandbits(128)).hex,
+        "title": _title(rng, index),
+        "release_date": _date(rng),
+        "description": _description(rng),
+        "technologies": rng.sample(TECHNOLOGIES, rng.randint(1, 4)),
+        "link": f"https://github.com/example/project-{index}"
+    }
+
+def _event(rng, index):
+    return {
+        "id": uuid.UUID(int=rng.getrandbits(128)).hex,
+        "date": _date(rng),
+        "title": _title(rng, index),
+        "description": _description(rng)
+    }
+
+def _photo(rng, size):
+    """A noisy JPEG, so every photo has distinct content and a realistic file size"""
+    noise = rng.randbytes(size[0] * size[1] * 3)
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", size, noise).save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+def generate_portfolio(target_dir, records, photos=0, photo_size=(800, 600), seed=0):
+    """Create target_dir/portfolio_data with `records` items per section; returns its path"""
+    rng = random.Random(seed)
+    data_dir = Path(target_dir) / "portfolio_data"
+    photos_dir = data_dir / "photos"
+    sections = {
+        "milestone_projects.json": ([_project(rng, i) for i in range(records)], photos_dir / "milestone"),
+        "small_projects.json": ([_project(rng, i) for i in range(records)], photos_dir / "small"),
+        "timeline_events.json": ([_event(rng, i) for i in range(records)], photos_dir)
+    }
+    for filename, (items, photo_dir) in sections.items():
+        photo_dir.mkdir(parents=True, exist_ok=True)
+        with open(data_dir / filename, 'w') as f:
+            json.dump(items, f, indent=2)
+        for item in items[:photos]:
+            (photo_dir / f"{item['id']}.jpg").write_bytes(_photo(rng, photo_size))
+    return data_dir
+
+def parse_size(value):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("target_dir", help="directory to create portfolio_data in")
+    parser.add_argument("--records", type=int, default=100, help="items per section")
+    parser.add_argument("--photos", type=int, default=0, help="photos per section")
+    parser.add_argument("--photo-size", type=parse_size, default=(800, 600), help="WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(generate_portfolio(args.target_dir, args.records, args.photos, args.photo_size, args.seed))
+
+if __name__ == "__main__":
+    main()
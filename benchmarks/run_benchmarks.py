@@ -0,0 +1,202 @@
+"""Benchmark streamlit_app.py headlessly against synthetic portfolios
+
+For each portfolio size this generates data, then drives the app with
+Streamlit's AppTest in fresh processes and records:
+
+- first_start: first run on new data, including the JSON and photo import
+- cold_start: first run of a new process on already imported data
+- load, render, add, edit, delete: per-operation rerun latency, plus the
+  peak Python memory allocated during each operation (tracemalloc)
+
+    python benchmarks/run_benchmarks.py --sizes 10 1000 10000 --photos 10
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<earlier>.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from portfolio_generator import generate_portfolio, parse_size
+
+APP_FILE = Path(__file__).resolve().parent.parent / "streamlit_app.py"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+OPERATIONS = ["load", "render", "add", "edit", "delete"]
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def _app_test():
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(str(APP_FILE), default_timeout=600)
+
+def _run(at):
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at
+
+def _button(at, label):
+    return next(b for b in at.button if b.label == label)
+
+# Operations on a session that has already run once
+def op_load(at):
+    # A new browser session in a warm process
+    return _run(_app_test())
+
+def op_render(at):
+    return _run(at)
+
+def op_add(at):
+    next(t for t in at.text_input if t.label == "Project Title").set_value(f"Benchmark {time.perf_counter_ns()}")
+    _button(at, "Add Project").click()
+    return _run(at)
+
+def op_edit(at):
+    edit = _button(at, "Edit")
+    project_key = edit.key.rsplit("_", 1)[1]
+    edit.click()
+    _run(at)
+    at.text_input(key=f"edit_m_title_{project_key}").set_value(f"Edited {time.perf_counter_ns()}")
+    _button(at, "Save Changes").click()
+    return _run(at)
+
+def op_delete(at):
+    _button(at, "Delete").click()
+    return _run(at)
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "runs": len(samples),
+        "min_ms": samples[0] * 1000,
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[min(len(samples) - 1, round(0.95 * (len(samples) - 1)))] * 1000,
+        "mean_ms": statistics.fmean(samples) * 1000
+    }
+
+def measure_session(repeat):
+    """Time every operation `repeat` times, then once more under tracemalloc"""
+    start = time.perf_counter()
+    at = _run(_app_test())
+    results = {"start_ms": (time.perf_counter() - start) * 1000, "operations": {}}
+    if repeat == 0:
+        return results
+    for name in OPERATIONS:
+        operation = globals()[f"op_{name}"]
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            operation(at)
+            samples.append(time.perf_counter() - start)
+        tracemalloc.start()
+        operation(at)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results["operations"][name] = dict(summarize(samples), peak_alloc_mb=peak / 2**20)
+    if resource is not None:
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        results["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+    return results
+
+def run_worker(work_dir, repeat):
+    """Run one measurement in a fresh process so caches and imports start cold"""
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", str(work_dir), "--repeat", str(repeat)],
+        cwd=work_dir, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def benchmark_size(records, photos, photo_size, repeat):
+    with tempfile.TemporaryDirectory(prefix="portfolio-bench-") as work_dir:
+        start = time.perf_counter()
+        generate_portfolio(work_dir, records, photos, photo_size)
+        generate_seconds = time.perf_counter() - start
+        first = run_worker(work_dir, 0)
+        session = run_worker(work_dir, repeat)
+    result = {
+        "records_per_section": records,
+        "photos_per_section": photos,
+        "generate_ms": generate_seconds * 1000,
+        "first_start_ms": first["start_ms"],
+        "cold_start_ms": session["start_ms"],
+        "operations": session["operations"]
+    }
+    if "peak_rss_mb" in session:
+        result["peak_rss_mb"] = session["peak_rss_mb"]
+    return result
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=APP_FILE.parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline):
+    """Print median and start-up time ratios against an earlier results file"""
+    previous = {run["records_per_section"]: run for run in baseline["runs"]}
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} ({baseline['created']}):")
+    for run in results["runs"]:
+        old = previous.get(run["records_per_section"])
+        if old is None:
+            continue
+        rows = [("first_start", old["first_start_ms"], run["first_start_ms"]),
+                ("cold_start", old["cold_start_ms"], run["cold_start_ms"])]
+        rows += [(name, old["operations"][name]["median_ms"], stats["median_ms"])
+                 for name, stats in run["operations"].items() if name in old["operations"]]
+        for name, before, after in rows:
+            print(f"  {run['records_per_section']:>6} {name:<12} {before:10.1f} ms -> {after:10.1f} ms  ({after / before:5.2f}x)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000], help="items per section")
+    parser.add_argument("--photos", type=int, default=10, help="photos per section")
+    parser.add_argument("--photo-size", type=parse_size, default=(800, 600), help="WIDTHxHEIGHT")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per operation")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier results file to compare against")
+    parser.add_argument("--worker", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        os.chdir(args.worker)
+        print(json.dumps(measure_session(args.repeat)))
+        return
+
+    created = datetime.now(timezone.utc)
+    results = {
+        "created": created.isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "environment": {key: value for key, value in os.environ.items() if key.startswith("PORTFOLIO_")},
+        "repeat": args.repeat,
+        "runs": []
+    }
+    for records in args.sizes:
+        print(f"Benchmarking {records} items per section...", file=sys.stderr)
+        results["runs"].append(benchmark_size(records, args.photos, args.photo_size, args.repeat))
+
+    output = args.output or RESULTS_DIR / f"{created.strftime('%Y%m%dT%H%M%SZ')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,41 @@
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from datetime import datetime
 import json
 import os
+import re
+import sys
 from pathlib import Path
 import base64
+import bisect
+import html
+import copy
+import shutil
+import hashlib
+import hmac
 import tempfile
+import sqlite3
+import uuid
+import threading
+import time
+import functools
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+import io
+from collections import OrderedDict, deque
+from html.parser import HTMLParser
+from itertools import islice
+from urllib.parse import urlsplit
+# markdown and Pillow are imported where they are used: most runs, and a
+# cold start on data that is already compiled, need neither.
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+RUN_STARTED = time.perf_counter()
 
 # Set page config
 st.set_page_config(
@@ -13,12 +44,9 @@ st.set_page_config(
     layout="wide"
 )
 
-# Create data directory for persistent storage
+# Data directory for persistent storage, created by initialize_data()
 DATA_DIR = Path("portfolio_data")
-DATA_DIR.mkdir(exist_ok=True)
-
 PHOTOS_DIR = DATA_DIR / "photos"
-PHOTOS_DIR.mkdir(exist_ok=True)
 
 # File paths for persistent storage
 MILESTONE_PROJECTS_FILE = DATA_DIR / "milestone_projects.json"
@@ -27,176 +55,1845 @@ TIMELINE_EVENTS_FILE = DATA_DIR / "timeline_events.json"
 MILESTONE_PHOTOS_DIR = PHOTOS_DIR / "milestone"
 SMALL_PHOTOS_DIR = PHOTOS_DIR / "small"
 
-MILESTONE_PHOTOS_DIR.mkdir(exist_ok=True)
-SMALL_PHOTOS_DIR.mkdir(exist_ok=True)
+DATABASE_FILE = DATA_DIR / "portfolio.db"
+JOURNAL_FILE = DATA_DIR / "journal.ndjson"
+LOCK_FILE = DATA_DIR / ".lock"
+# Uploaded photos waiting to be processed
+UPLOADS_DIR = DATA_DIR / "uploads"
+
+# Metrics
+# With PORTFOLIO_METRICS=1, loads, saves, photo work, card rendering and the
+# section loops are timed into rolling histograms, per session and for the
+# whole process. When it is off, @timed returns functions unchanged and
+# span() is a no-op context manager.
+METRICS_ENABLED = os.environ.get("PORTFOLIO_METRICS", "0").lower() in ("1", "true", "yes")
+METRICS_TOKEN = os.environ.get("PORTFOLIO_METRICS_TOKEN", "")
+METRICS_WINDOW = 1024
+METRICS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class SpanHistogram:
+    """Cumulative bucket counts plus a rolling window of recent durations (seconds)"""
+
+    def __init__(self, window=METRICS_WINDOW):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=window)
+        self.buckets = [0] * len(METRICS_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        with self._lock:
+            self._recent.append(seconds)
+            self.count += 1
+            self.total += seconds
+            index = bisect.bisect_left(METRICS_BUCKETS, seconds)
+            if index < len(self.buckets):
+                self.buckets[index] += 1
+
+    def snapshot(self):
+        with self._lock:
+            recent = sorted(self._recent)
+            buckets = list(self.buckets)
+            count, total = self.count, self.total
+        summary = {"count": count, "sum_ms": total * 1000, "buckets": dict(zip(METRICS_BUCKETS, buckets))}
+        if recent:
+            summary["recent"] = {
+                "samples": len(recent),
+                "p50_ms": recent[len(recent) // 2] * 1000,
+                "p95_ms": recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000,
+                "max_ms": recent[-1] * 1000
+            }
+        return summary
+
+class Metrics:
+    """Span histograms by name"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans = {}
+
+    def observe(self, name, seconds):
+        histogram = self._spans.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._spans.setdefault(name, SpanHistogram())
+        histogram.observe(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            spans = dict(self._spans)
+        return {name: spans[name].snapshot() for name in sorted(spans)}
+
+    def rows(self):
+        """One summary row per span for display"""
+        rows = []
+        for name, summary in self.snapshot().items():
+            recent = summary.get("recent", {})
+            rows.append({
+                "span": name,
+                "count": summary["count"],
+                "mean ms": round(summary["sum_ms"] / summary["count"], 2) if summary["count"] else None,
+                "p50 ms": round(recent["p50_ms"], 2) if recent else None,
+                "p95 ms": round(recent["p95_ms"], 2) if recent else None,
+                "max ms": round(recent["max_ms"], 2) if recent else None
+            })
+        return rows
+
+    def prometheus(self):
+        """Prometheus text exposition format"""
+        metric = "portfolio_span_duration_seconds"
+        lines = [
+            f"# HELP {metric} Time spent in instrumented portfolio code paths.",
+            f"# TYPE {metric} histogram"
+        ]
+        for name, summary in self.snapshot().items():
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for bound, bucket_count in summary["buckets"].items():
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{span="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{span="{label}",le="+Inf"}} {summary["count"]}')
+            lines.append(f'{metric}_sum{{span="{label}"}} {summary["sum_ms"] / 1000}')
+            lines.append(f'{metric}_count{{span="{label}"}} {summary["count"]}')
+        return "\n".join(lines) + "\n"
+
+@st.cache_resource
+def get_process_metrics():
+    return Metrics()
+
+def record_span(name, seconds):
+    get_process_metrics().observe(name, seconds)
+    # Background photo workers have no session to report to
+    if get_script_run_ctx(suppress_warning=True) is not None:
+        if "metrics" not in st.session_state:
+            st.session_state.metrics = Metrics()
+        st.session_state.metrics.observe(name, seconds)
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record_span(self.name, time.perf_counter() - self.start)
+
+_NO_SPAN = contextlib.nullcontext()
+
+def span(name):
+    """Time a block under `name` when metrics are enabled"""
+    return _Span(name) if METRICS_ENABLED else _NO_SPAN
+
+def timed(name):
+    """Decorator form of span(); returns the function itself when metrics are off"""
+    def decorate(func):
+        if not METRICS_ENABLED:
+            return func
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+# Storage backends
+# Records live in three collections. Every record carries a generated "id"
+# so a single add, edit or delete only touches that record.
+MILESTONE_PROJECTS = "milestone_projects"
+SMALL_PROJECTS = "small_projects"
+TIMELINE_EVENTS = "timeline_events"
+
+PROJECT_KINDS = {MILESTONE_PROJECTS: "milestone", SMALL_PROJECTS: "small"}
+
+LEGACY_JSON_FILES = {
+    MILESTONE_PROJECTS: MILESTONE_PROJECTS_FILE,
+    SMALL_PROJECTS: SMALL_PROJECTS_FILE,
+    TIMELINE_EVENTS: TIMELINE_EVENTS_FILE
+}
+
+STORAGE_BACKEND = os.environ.get("PORTFOLIO_STORAGE", "sqlite")
+JOURNAL_COMPACT_EVERY = int(os.environ.get("PORTFOLIO_JOURNAL_COMPACT_EVERY", "100"))
+
+def new_record_id():
+    return uuid.uuid4().hex
+
+def assign_record_ids(records):
+    """Give records loaded from older files an id; returns True if any was added"""
+    changed = False
+    for record in records:
+        if not record.get("id"):
+            record["id"] = new_record_id()
+            changed = True
+    return changed
+
+def atomic_write(path, data):
+    """Write a file through a temp file + rename so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(data, bytes) else 'w') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+class StorageConflict(Exception):
+    """A record was changed or deleted by another session since it was loaded
+
+    The storage object outlives script reruns, which redefine this class, so
+    callers catch `storage.Conflict` rather than the module-level name.
+    """
+
+class FileLock:
+    """Advisory lock on a file shared by every worker using the data directory
+
+    Falls back to no cross-process locking where fcntl is unavailable.
+    """
+
+    def __init__(self, path, shared=False):
+        self.path = path
+        self.shared = shared
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, 'a')
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+class JsonStorage:
+    """JSON snapshots plus an append-only journal of change records
+
+    Each change is appended to the journal and fsynced. Every
+    `compact_every` changes the snapshots are rewritten atomically and the
+    journal is started afresh with a new generation id as its first line.
+    Other workers pick up new changes by reading the journal from where they
+    last stopped, and reload fully when the generation id has changed.
+    Inode numbers can be reused, so they do not identify a journal.
+    Replaying a change twice is harmless.
+    """
+
+    Conflict = StorageConflict
+
+    def __init__(self, files, journal_file, lock_file, compact_every=100, history=None):
+        self.files = files
+        self.journal_file = journal_file
+        self.lock_file = lock_file
+        self.compact_every = compact_every
+        self.history = history
+        self._lock = threading.Lock()
+        self._collections = {}
+        self._versions = {collection: 0 for collection in files}
+        with self._lock, FileLock(lock_file):
+            if self._reload():
+                self._compact()
+
+    def _reload(self):
+        """Read the snapshots and replay the whole journal; returns True if a compaction is due"""
+        ids_assigned = False
+        for collection, path in self.files.items():
+            records = []
+            if path.exists():
+                with open(path, 'r') as f:
+                    records = json.load(f)
+            ids_assigned |= assign_record_ids(records)
+            self._collections[collection] = {r["id"]: r for r in records}
+            self._versions[collection] += 1
+        self._journal_generation = None
+        self._journal_stat = None
+        self._journal_offset = 0
+        self._pending = 0
+        torn = self._catch_up()
+        # A journal without a generation id (missing, or from an older
+        # version) is compacted to get one
+        return ids_assigned or torn or self._journal_generation is None or self._pending >= self.compact_every
+
+    @staticmethod
+    def _generation(line):
+        try:
+            header = json.loads(line) if line.endswith(b"\n") else None
+        except ValueError:
+            return None
+        return header.get("generation") if isinstance(header, dict) and "op" not in header else None
+
+    def _catch_up(self):
+        """Apply journal changes written since the last read; returns True on a torn final line"""
+        try:
+            f = open(self.journal_file, 'rb')
+        except FileNotFoundError:
+            return False
+        with f:
+            stat = os.fstat(f.fileno())
+            header = f.readline()
+            generation = self._generation(header)
+            if self._journal_offset and (generation != self._journal_generation or stat.st_size < self._journal_offset):
+                # Another worker compacted the journal
+                return self._reload()
+            self._journal_generation = generation
+            self._journal_offset = max(self._journal_offset, len(header) if generation is not None else 0)
+            f.seek(self._journal_offset)
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete journal line")
+                    change = json.loads(line)
+                except ValueError:
+                    if f.read(1):
+                        # Not a torn append: refuse to compact over the changes after it
+                        raise ValueError(f"{self.journal_file} has an unreadable line at byte {self._journal_offset}")
+                    # A torn final line from a crash mid-append. The next
+                    # write reloads and compacts before appending after it.
+                    return True
+                self._apply(change)
+                self._journal_offset += len(line)
+                self._pending += 1
+            self._journal_stat = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        return False
+
+    def _apply(self, change):
+        collection = change["collection"]
+        records = self._collections[collection]
+        if change["op"] == "delete":
+            records.pop(change["id"], None)
+        else:
+            records[change["record"]["id"]] = change["record"]
+        self._versions[collection] += 1
+
+    def _write(self, change, expected_version=None, if_absent=False):
+        return self._write_many([change], expected_version, if_absent)
+
+    def _write_many(self, changes, expected_version=None, if_absent=False):
+        """Append changes to one collection with a single fsync
+
+        The version check, and with `if_absent` the check that the record
+        does not exist (returning None if it does), apply to the first change.
+        """
+        collection = changes[0]["collection"]
+        with self._lock, FileLock(self.lock_file):
+            if self._catch_up():
+                # Only compact from state replayed in full from disk
+                self._reload()
+                self._compact()
+            if if_absent and changes[0]["record"]["id"] in self._collections[collection]:
+                return None
+            if expected_version is not None:
+                change = changes[0]
+                record_id = change["id"] if change["op"] == "delete" else change["record"]["id"]
+                current = self._collections[collection].get(record_id)
+                if current is None or current.get("version", 0) != expected_version:
+                    raise self.Conflict(f"{collection}/{record_id} was changed by another session")
+            data = "".join(json.dumps(change) + "\n" for change in changes).encode("utf-8")
+            with open(self.journal_file, 'ab') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                stat = os.fstat(f.fileno())
+            self._journal_stat = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            self._journal_offset += len(data)
+            logged = []
+            for change in changes:
+                if self.history is not None and change["op"] != "insert":
+                    record_id = change["id"] if change["op"] == "delete" else change["record"]["id"]
+                    logged.append(self.history.record(collection, self._collections[collection].get(record_id), change.get("record")))
+                self._apply(change)
+                self._pending += 1
+            if self._pending >= self.compact_every:
+                self._compact()
+            version = self._versions[collection]
+        for entry in logged:
+            if entry is not None:
+                self.history.compress(entry)
+        return version
+
+    def _compact(self):
+        for collection, path in self.files.items():
+            atomic_write(path, json.dumps(list(self._collections[collection].values()), indent=2))
+        generation = uuid.uuid4().hex
+        header = (json.dumps({"generation": generation}) + "\n").encode("utf-8")
+        atomic_write(self.journal_file, header)
+        stat = os.stat(self.journal_file)
+        self._journal_generation = generation
+        self._journal_stat = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        self._journal_offset = len(header)
+        self._pending = 0
+
+    def compact(self):
+        with self._lock, FileLock(self.lock_file):
+            if self._catch_up():
+                self._reload()
+            self._compact()
+
+    def refresh(self):
+        """Pick up changes other workers appended to the journal"""
+        try:
+            stat = os.stat(self.journal_file)
+        except FileNotFoundError:
+            return
+        if (stat.st_ino, stat.st_size, stat.st_mtime_ns) == self._journal_stat:
+            return
+        with self._lock, FileLock(self.lock_file, shared=True):
+            self._catch_up()
+
+    @timed("storage.versions")
+    def versions(self):
+        self.refresh()
+        with self._lock:
+            return dict(self._versions)
+
+    @timed("storage.load")
+    def load(self, collection):
+        self.refresh()
+        with self._lock:
+            return copy.deepcopy(list(self._collections[collection].values()))
+
+    def get(self, collection, record_id):
+        """The stored record with this id, or None"""
+        self.refresh()
+        with self._lock:
+            return copy.deepcopy(self._collections[collection].get(record_id))
+
+    @timed("storage.insert")
+    def insert(self, collection, record, if_absent=False):
+        """Add a record; with `if_absent`, returns None instead if one with its id exists"""
+        record["version"] = 1
+        return self._write({"op": "insert", "collection": collection, "record": record}, if_absent=if_absent)
+
+    @timed("storage.insert_many")
+    def insert_many(self, collection, records):
+        """Insert a batch of new records with one journal write"""
+        for record in records:
+            record["version"] = 1
+        return self._write_many([{"op": "insert", "collection": collection, "record": record} for record in records])
+
+    @timed("storage.update")
+    def update(self, collection, record):
+        """Save an edited record; raises StorageConflict if it is stale"""
+        expected = record.get("version", 0)
+        stored = dict(record, version=expected + 1)
+        version = self._write({"op": "update", "collection": collection, "record": stored}, expected)
+        record["version"] = expected + 1
+        return version
+
+    @timed("storage.delete")
+    def delete(self, collection, record_id, expected_version=None):
+        return self._write({"op": "delete", "collection": collection, "id": record_id}, expected_version)
+
+class SqliteStorage:
+    """SQLite tables for projects and events with row-level writes
+
+    Each record row carries a version number for conflict checks, and
+    the meta table keeps a change counter per collection so sessions can
+    tell cheaply whether anything changed.
+    """
+
+    Conflict = StorageConflict
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS projects (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            release_date TEXT,
+            data TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS projects_kind_seq ON projects (kind, seq);
+        CREATE TABLE IF NOT EXISTS events (
+            id TEXT PRIMARY KEY,
+            seq INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            title TEXT NOT NULL,
+            data TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS events_date ON events (date, seq);
+    """
+
+    def __init__(self, db_file, lock_file, legacy_files=None, history=None):
+        self.lock_file = lock_file
+        self.history = history
+        self._conn = sqlite3.connect(db_file, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock, FileLock(lock_file), self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+            for table in ("projects", "events"):
+                columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                if "version" not in columns:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        if legacy_files:
+            self.migrate_json(legacy_files)
+
+    def migrate_json(self, legacy_files):
+        """Import the old JSON files once; the files themselves are left in place"""
+        with self._lock, FileLock(self.lock_file), self._conn:
+            if self._conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+                return
+            for collection, path in legacy_files.items():
+                if not path.exists():
+                    continue
+                with open(path, 'r') as f:
+                    records = json.load(f)
+                assign_record_ids(records)
+                for record in records:
+                    record["version"] = 1
+                    self._insert(collection, record)
+                self._bump(collection)
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (datetime.now().isoformat(),))
+
+    def _bump(self, collection):
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+            (f"version:{collection}",)
+        )
+        (value,) = self._conn.execute("SELECT value FROM meta WHERE key = ?", (f"version:{collection}",)).fetchone()
+        return int(value)
+
+    def refresh(self):
+        pass
+
+    @timed("storage.versions")
+    def versions(self):
+        versions = {collection: 0 for collection in LEGACY_JSON_FILES}
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM meta WHERE key LIKE 'version:%'").fetchall()
+        for key, value in rows:
+            versions[key.split(":", 1)[1]] = int(value)
+        return versions
+
+    @timed("storage.load")
+    def load(self, collection):
+        with self._lock:
+            if collection in PROJECT_KINDS:
+                rows = self._conn.execute(
+                    "SELECT data, version FROM projects WHERE kind = ? ORDER BY seq", (PROJECT_KINDS[collection],)
+                ).fetchall()
+            else:
+                rows = self._conn.execute("SELECT data, version FROM events ORDER BY seq").fetchall()
+        records = []
+        for data, version in rows:
+            record = json.loads(data)
+            record["version"] = version
+            records.append(record)
+        return records
+
+    def _get(self, collection, record_id):
+        table = "projects" if collection in PROJECT_KINDS else "events"
+        row = self._conn.execute(f"SELECT data, version FROM {table} WHERE id = ?", (record_id,)).fetchone()
+        if row is None:
+            return None
+        return dict(json.loads(row[0]), version=row[1])
+
+    def get(self, collection, record_id):
+        """The stored record with this id, or None"""
+        with self._lock:
+            return self._get(collection, record_id)
+
+    def _insert(self, collection, record):
+        data = json.dumps(record)
+        if collection in PROJECT_KINDS:
+            kind = PROJECT_KINDS[collection]
+            self._conn.execute(
+                "INSERT INTO projects (id, kind, seq, title, release_date, data, version) "
+                "VALUES (?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM projects WHERE kind = ?), ?, ?, ?, ?)",
+                (record["id"], kind, kind, record["title"], record.get("release_date"), data, record["version"])
+            )
+        else:
+            self._conn.execute(
+                "INSERT INTO events (id, seq, date, title, data, version) "
+                "VALUES (?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM events), ?, ?, ?, ?)",
+                (record["id"], record["date"], record["title"], data, record["version"])
+            )
+
+    @timed("storage.insert")
+    def insert(self, collection, record, if_absent=False):
+        """Add a record; with `if_absent`, returns None instead if one with its id exists"""
+        record["version"] = 1
+        with self._lock, FileLock(self.lock_file), self._conn:
+            if if_absent and self._get(collection, record["id"]) is not None:
+                return None
+            self._insert(collection, record)
+            return self._bump(collection)
+
+    @timed("storage.insert_many")
+    def insert_many(self, collection, records):
+        """Insert a batch of new records in one transaction"""
+        with self._lock, FileLock(self.lock_file), self._conn:
+            for record in records:
+                record["version"] = 1
+                self._insert(collection, record)
+            return self._bump(collection)
+
+    @timed("storage.update")
+    def update(self, collection, record):
+        """Save an edited record; raises StorageConflict if it is stale"""
+        expected = record.get("version", 0)
+        stored = dict(record, version=expected + 1)
+        data = json.dumps(stored)
+        with self._lock, FileLock(self.lock_file), self._conn:
+            previous = self._get(collection, record["id"]) if self.history is not None else None
+            if collection in PROJECT_KINDS:
+                cursor = self._conn.execute(
+                    "UPDATE projects SET title = ?, release_date = ?, data = ?, version = ? WHERE id = ? AND version = ?",
+                    (record["title"], record.get("release_date"), data, expected + 1, record["id"], expected)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE events SET date = ?, title = ?, data = ?, version = ? WHERE id = ? AND version = ?",
+                    (record["date"], record["title"], data, expected + 1, record["id"], expected)
+                )
+            if cursor.rowcount == 0:
+                raise self.Conflict(f"{collection}/{record['id']} was changed by another session")
+            logged = self.history.record(collection, previous, stored) if self.history is not None else None
+            version = self._bump(collection)
+        if logged is not None:
+            self.history.compress(logged)
+        record["version"] = expected + 1
+        return version
+
+    @timed("storage.delete")
+    def delete(self, collection, record_id, expected_version=None):
+        table = "projects" if collection in PROJECT_KINDS else "events"
+        with self._lock, FileLock(self.lock_file), self._conn:
+            previous = self._get(collection, record_id) if self.history is not None else None
+            if expected_version is None:
+                cursor = self._conn.execute(f"DELETE FROM {table} WHERE id = ?", (record_id,))
+            else:
+                cursor = self._conn.execute(
+                    f"DELETE FROM {table} WHERE id = ? AND version = ?", (record_id, expected_version)
+                )
+                if cursor.rowcount == 0:
+                    raise self.Conflict(f"{collection}/{record_id} was changed by another session")
+            if self.history is not None:
+                self.history.record(collection, previous, None)
+            return self._bump(collection)
+
+# Version history
+# Each edit logs a reverse delta that turns the new version back into the
+# one it replaced: only the fields that changed, with long text fields as a
+# word-level diff, so history grows with the size of each change rather
+# than the record or collection. Earlier versions are rebuilt by applying
+# deltas newest first to the stored record. A delete logs the whole record
+# so it can be brought back. The storage backends log changes while they
+# hold the write lock, against the record as stored, so several workers
+# writing still produce one unbroken chain per record. Inside the lock an
+# edit is logged with its changed fields whole; the text diffs are worked
+# out after the lock is released and replace them in the same entry.
+HISTORY_FILE = DATA_DIR / "history.db"
+HISTORY_VERSIONS = max(0, int(os.environ.get("PORTFOLIO_HISTORY_VERSIONS", "20")))
+HISTORY_DAYS = max(0, int(os.environ.get("PORTFOLIO_HISTORY_DAYS", "90")))
+# Kept by storage or derived from other fields, so not versioned
+UNVERSIONED_FIELDS = {"id", "version", "description_html", "description_hash"}
+# A word with the whitespace after it
+HISTORY_TOKEN = re.compile(r"\S+\s*|\s+")
+# Diffing takes time quadratic in the changed span, so larger spans are stored whole
+HISTORY_DIFF_MAX_TOKENS = 1000
+
+def text_delta(new, old):
+    """Operations turning `new` into `old`, or None if the changed span is too large to diff
+
+    A positive number copies that many characters of `new`, a negative
+    number skips them and a string is inserted; the rest of `new` is copied.
+    """
+    import difflib
+    # Only the span between the common prefix and suffix is diffed
+    prefix = len(os.path.commonprefix([new, old]))
+    suffix = len(os.path.commonprefix([new[prefix:][::-1], old[prefix:][::-1]]))
+    a = HISTORY_TOKEN.findall(new[prefix:len(new) - suffix])
+    b = HISTORY_TOKEN.findall(old[prefix:len(old) - suffix])
+    if len(a) + len(b) > HISTORY_DIFF_MAX_TOKENS:
+        return None
+    ops = [prefix] if prefix else []
+    def emit(op):
+        if ops and isinstance(op, str) == isinstance(ops[-1], str) and (isinstance(op, str) or (op > 0) == (ops[-1] > 0)):
+            ops[-1] += op
+        else:
+            ops.append(op)
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            emit(sum(map(len, a[i1:i2])))
+            continue
+        if i2 > i1:
+            emit(-sum(map(len, a[i1:i2])))
+        if j2 > j1:
+            emit("".join(b[j1:j2]))
+    if ops and not isinstance(ops[-1], str) and ops[-1] > 0:
+        ops.pop()
+    return ops
+
+def apply_text_delta(new, ops):
+    parts, pos = [], 0
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        elif op > 0:
+            parts.append(new[pos:pos + op])
+            pos += op
+        else:
+            pos -= op
+    parts.append(new[pos:])
+    return "".join(parts)
+
+def record_delta(new, old, diff=True):
+    """Delta turning record `new` back into `old`, or None if no versioned field differs
+
+    With `diff` false, changed text fields are stored whole.
+    """
+    delta = {}
+    for field, value in old.items():
+        if field in UNVERSIONED_FIELDS or (field in new and new[field] == value):
+            continue
+        if diff and isinstance(value, str) and isinstance(new.get(field), str):
+            ops = text_delta(new[field], value)
+            if ops is not None and len(json.dumps(ops)) < len(json.dumps(value)):
+                delta.setdefault("diff", {})[field] = ops
+                continue
+        delta.setdefault("set", {})[field] = value
+    unset = [field for field in new if field not in old and field not in UNVERSIONED_FIELDS]
+    if unset:
+        delta["unset"] = unset
+    return delta or None
+
+def apply_record_delta(record, delta):
+    older = {field: value for field, value in record.items() if field not in delta.get("unset", ())}
+    older.update(delta.get("set", {}))
+    for field, ops in delta.get("diff", {}).items():
+        older[field] = apply_text_delta(record[field], ops)
+    return older
+
+def versioned_fields(record):
+    return {field: value for field, value in record.items() if field not in UNVERSIONED_FIELDS}
+
+class RecordHistory:
+    """SQLite log of record deltas with a retention policy
+
+    Keeps the newest `keep` entries per record, and drops entries older
+    than `max_age_days` (0 keeps them regardless of age). `keep=0` turns
+    history off.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS history (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            collection TEXT NOT NULL,
+            record_id TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            saved_at REAL NOT NULL,
+            deleted INTEGER NOT NULL DEFAULT 0,
+            delta TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS history_record ON history (collection, record_id, seq);
+        CREATE INDEX IF NOT EXISTS history_saved_at ON history (saved_at);
+    """
+
+    def __init__(self, history_file, keep=20, max_age_days=90):
+        self.keep = keep
+        self.max_age = max_age_days * 24 * 3600
+        self._conn = sqlite3.connect(history_file, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+
+    @timed("history.record")
+    def record(self, collection, previous, current):
+        """Log that stored record `previous` was replaced by `current`, or deleted if it is None
+
+        Returns what `compress` needs to shrink a logged edit, or None.
+        """
+        if previous is None or not self.keep:
+            return None
+        if current is None:
+            delta = {"set": versioned_fields(previous)}
+        else:
+            delta = record_delta(current, previous, diff=False)
+            if delta is None:
+                return None
+        with self._lock, self._conn:
+            seq = self._conn.execute(
+                "INSERT INTO history (collection, record_id, version, saved_at, deleted, delta) VALUES (?, ?, ?, ?, ?, ?)",
+                (collection, previous["id"], previous.get("version", 0), time.time(), current is None, json.dumps(delta))
+            ).lastrowid
+            self._conn.execute(
+                "DELETE FROM history WHERE collection = ? AND record_id = ? AND seq NOT IN "
+                "(SELECT seq FROM history WHERE collection = ? AND record_id = ? ORDER BY seq DESC LIMIT ?)",
+                (collection, previous["id"], collection, previous["id"], self.keep)
+            )
+            if self.max_age:
+                self._conn.execute("DELETE FROM history WHERE saved_at < ?", (time.time() - self.max_age,))
+        return None if current is None else (seq, previous, current, delta)
+
+    @timed("history.compress")
+    def compress(self, logged):
+        """Store a logged edit's changed text fields as diffs where that is smaller; call outside storage locks"""
+        seq, previous, current, delta = logged
+        compressed = record_delta(current, previous)
+        if compressed == delta:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE history SET delta = ? WHERE seq = ?", (json.dumps(compressed), seq))
+
+    @timed("history.versions")
+    def versions(self, collection, record_id, current):
+        """Earlier versions of a record, newest first
+
+        `current` is the stored record, or None if it is deleted. Each
+        version is a dict with "seq", "version", "saved_at", "deleted"
+        and the rebuilt "record".
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, version, saved_at, deleted, delta FROM history "
+                "WHERE collection = ? AND record_id = ? ORDER BY seq DESC",
+                (collection, record_id)
+            ).fetchall()
+        state = None if current is None else versioned_fields(current)
+        versions = []
+        for seq, version, saved_at, deleted, delta in rows:
+            delta = json.loads(delta)
+            if deleted:
+                # A record that was brought back matches its last deleted state
+                restored = state is not None
+                state = delta["set"]
+                if restored:
+                    continue
+            elif state is None:
+                break
+            else:
+                state = apply_record_delta(state, delta)
+            versions.append({
+                "seq": seq, "version": version, "saved_at": saved_at, "deleted": bool(deleted),
+                "record": dict(state, id=record_id)
+            })
+        return versions
+
+    def deleted(self, collection, limit=20):
+        """The most recently deleted records of a collection as (saved_at, record)
+
+        Records restored since are included, so callers skip ids they have.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record_id, saved_at, delta FROM history AS h WHERE collection = ? AND deleted = 1 "
+                "AND seq = (SELECT MAX(seq) FROM history WHERE collection = h.collection AND record_id = h.record_id) "
+                "ORDER BY seq DESC LIMIT ?",
+                (collection, limit)
+            ).fetchall()
+        return [(saved_at, dict(json.loads(delta)["set"], id=record_id)) for record_id, saved_at, delta in rows]
+
+@st.cache_resource
+def get_record_history():
+    return RecordHistory(HISTORY_FILE, HISTORY_VERSIONS, HISTORY_DAYS)
+
+@st.cache_resource
+def get_storage():
+    if STORAGE_BACKEND == "json":
+        return JsonStorage(LEGACY_JSON_FILES, JOURNAL_FILE, LOCK_FILE, JOURNAL_COMPACT_EVERY, history=get_record_history())
+    return SqliteStorage(DATABASE_FILE, LOCK_FILE, legacy_files=LEGACY_JSON_FILES, history=get_record_history())
+
+# Timeline ordering
+class SortedTimeline:
+    """Timeline events kept newest first and updated by bisection
+
+    Events are ordered by date, newest first, and then by insertion order.
+    An event's "id" is its stable handle for edits and deletes.
+    """
+
+    def __init__(self, events=()):
+        self._keys = []
+        self._events = []
+        self._handles = {}
+        self._by_id = {}
+        self._seq = 0
+        for event in events:
+            self.add(event)
+
+    @staticmethod
+    def _date_rank(event):
+        return -datetime.strptime(event['date'], '%Y-%m-%d').toordinal()
+
+    def add(self, event, seq=None):
+        if seq is None:
+            self._seq += 1
+            seq = self._seq
+        key = (self._date_rank(event), seq)
+        pos = bisect.bisect_right(self._keys, key)
+        self._keys.insert(pos, key)
+        self._events.insert(pos, event)
+        self._handles[event['id']] = key
+        self._by_id[event['id']] = event
+
+    def remove(self, handle):
+        key = self._handles.pop(handle)
+        del self._by_id[handle]
+        pos = bisect.bisect_left(self._keys, key)
+        del self._keys[pos]
+        return self._events.pop(pos)
+
+    def update(self, event):
+        """Replace an event, keeping its place among events on the same date"""
+        _, seq = self._handles[event['id']]
+        self.remove(event['id'])
+        self.add(event, seq=seq)
+
+    def get(self, handle):
+        return self._by_id.get(handle)
+
+    def __getitem__(self, index):
+        return self._events[index]
+
+    def __len__(self):
+        return len(self._events)
 
-# Load data from files
+    def __iter__(self):
+        return iter(self._events)
+
+    def __copy__(self):
+        """An independent ordering over the same event dicts"""
+        clone = SortedTimeline()
+        clone._keys = list(self._keys)
+        clone._events = list(self._events)
+        clone._handles = dict(self._handles)
+        clone._by_id = dict(self._by_id)
+        clone._seq = self._seq
+        return clone
+
+# Search index
+# Words from titles, descriptions and technologies map to the ids of the
+# records containing them, and each technology maps to the projects tagged
+# with it. Like the records, an index is built once per collection version
+# and shared; a session's copy shares the id sets with it and copies a set
+# only the first time one of the session's own edits changes it. Only the
+# technology facet is built up front: the word index is built the first
+# time a search needs it, and kept up to date from then on.
+SEARCH_WORD = re.compile(r"\w+")
+
+def search_terms(text):
+    """The distinct lowercased words in text"""
+    return set(SEARCH_WORD.findall(text.casefold()))
+
+def record_terms(record):
+    return search_terms(" ".join([record['title'], record['description'], *record.get('technologies', [])]))
+
+class SearchIndex:
+    """Inverted index over one collection, updated one record at a time"""
+
+    def __init__(self, records=()):
+        # id -> (record, its words or None before the word index is built, technology keys)
+        self._entries = {}
+        self._words = None
+        self._technologies = {}
+        self._labels = {}
+        # Keys whose id sets belong to this index rather than a copied-from one
+        self._own_words = set()
+        self._own_technologies = set()
+        self._lock = threading.Lock()
+        for record in records:
+            self.add(record)
+
+    @staticmethod
+    def _ids(table, owned, key):
+        """The id set for key, copied first if it is shared with another index"""
+        if key in owned:
+            return table[key]
+        ids = table[key] = set(table.get(key, ()))
+        owned.add(key)
+        return ids
+
+    @staticmethod
+    def _drop(table, owned, key, record_id):
+        if len(table[key]) > 1:
+            SearchIndex._ids(table, owned, key).discard(record_id)
+        else:
+            del table[key]
+            owned.discard(key)
+
+    def add(self, record):
+        """Index a record, replacing an earlier version of it"""
+        record_id = record['id']
+        if record_id in self._entries:
+            self.remove(record_id)
+        tags = {}
+        for technology in record.get('technologies', []):
+            tags.setdefault(technology.casefold(), technology)
+        for key, label in tags.items():
+            self._ids(self._technologies, self._own_technologies, key).add(record_id)
+            self._labels.setdefault(key, label)
+        words = None
+        if self._words is not None:
+            words = record_terms(record)
+            for word in words:
+                self._ids(self._words, self._own_words, word).add(record_id)
+        self._entries[record_id] = (record, words, tags.keys())
+
+    def remove(self, record_id):
+        _, words, tags = self._entries.pop(record_id)
+        for key in tags:
+            self._drop(self._technologies, self._own_technologies, key, record_id)
+            if key not in self._technologies:
+                del self._labels[key]
+        if self._words is not None:
+            for word in words:
+                self._drop(self._words, self._own_words, word, record_id)
+
+    def sync(self, records):
+        """Bring the index in line with records, re-indexing only what changed"""
+        seen = set()
+        for record in records:
+            seen.add(record['id'])
+            entry = self._entries.get(record['id'])
+            if entry is None or entry[0] != record:
+                self.add(record)
+        for record_id in self._entries.keys() - seen:
+            self.remove(record_id)
+
+    @property
+    def has_words(self):
+        return self._words is not None
+
+    def index_words(self):
+        """Build the word index; safe to call from several sessions at once"""
+        with self._lock:
+            if self._words is not None:
+                return
+            entries, table = {}, {}
+            for record_id, (record, _, tags) in self._entries.items():
+                words = record_terms(record)
+                for word in words:
+                    ids = table.get(word)
+                    if ids is None:
+                        table[word] = {record_id}
+                    else:
+                        ids.add(record_id)
+                entries[record_id] = (record, words, tags)
+            # Readers that see the new entries before the words still work
+            self._entries = entries
+            self._own_words = set(table)
+            self._words = table
+
+    def search(self, words=(), technologies=()):
+        """Ids of records with a word starting with each of words and all technologies"""
+        matches = None
+        if words:
+            self.index_words()
+        for word in words:
+            ids = set()
+            for term, term_ids in self._words.items():
+                if term.startswith(word):
+                    ids |= term_ids
+            matches = ids if matches is None else matches & ids
+        for key in technologies:
+            ids = self._technologies.get(key, set())
+            matches = set(ids) if matches is None else matches & ids
+        return set(self._entries) if matches is None else matches
+
+    def technologies(self):
+        """{technology key: (label, number of records)} for the facet filter"""
+        return {key: (self._labels[key], len(ids)) for key, ids in self._technologies.items()}
+
+    def __copy__(self):
+        """An index sharing this one's id sets until it changes them"""
+        clone = SearchIndex()
+        # Words first: once they are set, the entries already carry theirs
+        words = self._words
+        clone._entries = dict(self._entries)
+        clone._technologies = dict(self._technologies)
+        clone._labels = dict(self._labels)
+        if words is not None:
+            clone._words = dict(words)
+        return clone
+
+# Description rendering
+# Descriptions are written in Markdown. They are compiled once, when a
+# record is saved, to sanitized HTML stored on the record together with a
+# hash of the source text, so cards never render or trust raw input.
+ALLOWED_TAGS = {
+    "p", "br", "hr", "strong", "b", "em", "i", "u", "s", "del", "code", "pre",
+    "blockquote", "ul", "ol", "li", "h1", "h2", "h3", "h4", "h5", "h6", "a",
+    "table", "thead", "tbody", "tr", "th", "td"
+}
+VOID_TAGS = {"br", "hr"}
+DROP_CONTENT_TAGS = {"script", "style", "iframe", "object", "embed", "template", "noscript", "textarea", "title"}
+ALLOWED_ATTRIBUTES = {"a": {"href", "title"}, "th": {"align"}, "td": {"align"}}
+ALLOWED_URL_SCHEMES = {"", "http", "https", "mailto"}
+
+def safe_url(url):
+    """Return the URL if its scheme is allowed, otherwise an empty string"""
+    if urlsplit(url.strip()).scheme.lower() in ALLOWED_URL_SCHEMES:
+        return url.strip()
+    return ""
+
+class _HtmlSanitizer(HTMLParser):
+    """Keep an allowlist of tags and attributes, escape everything else"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._open = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self._skip_depth += 1
+            return
+        if self._skip_depth or tag not in ALLOWED_TAGS:
+            return
+        rendered = []
+        for name, value in attrs:
+            if name not in ALLOWED_ATTRIBUTES.get(tag, ()) or value is None:
+                continue
+            if name == "href":
+                value = safe_url(value)
+                if not value:
+                    continue
+            rendered.append(f' {name}="{html.escape(value)}"')
+        if tag == "a":
+            rendered.append(' target="_blank" rel="noopener noreferrer"')
+        self.parts.append(f"<{tag}{''.join(rendered)}>")
+        if tag not in VOID_TAGS:
+            self._open.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if self._skip_depth or tag not in self._open:
+            return
+        while self._open:
+            open_tag = self._open.pop()
+            self.parts.append(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(html.escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        return "".join(self.parts) + "".join(f"</{tag}>" for tag in reversed(self._open))
+
+def sanitize_html(html_text):
+    sanitizer = _HtmlSanitizer()
+    sanitizer.feed(html_text)
+    return sanitizer.result()
+
+@timed("render.markdown")
+@st.cache_data(max_entries=1024, show_spinner=False)
+def render_description(text):
+    """Compile Markdown to sanitized HTML"""
+    import markdown
+    return sanitize_html(markdown.markdown(text or "", extensions=["sane_lists", "tables"]))
+
+def description_hash(text):
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()[:16]
+
+def compile_description(record):
+    """Refresh a record's cached description HTML if its source changed; returns True if it did"""
+    digest = description_hash(record.get("description"))
+    if record.get("description_hash") == digest and "description_html" in record:
+        return False
+    record["description_html"] = render_description(record.get("description", ""))
+    record["description_hash"] = digest
+    return True
+
+def description_html(record):
+    cached = record.get("description_html")
+    if cached is None or record.get("description_hash") != description_hash(record.get("description")):
+        return render_description(record.get("description", ""))
+    return cached
+
+def compile_stored_descriptions():
+    """Compile descriptions of records saved before HTML was cached"""
+    storage = get_storage()
+    for collection in (MILESTONE_PROJECTS, SMALL_PROJECTS, TIMELINE_EVENTS):
+        for record in storage.load(collection):
+            if compile_description(record):
+                try:
+                    storage.update(collection, record)
+                except storage.Conflict:
+                    # Another worker starting up compiled it first
+                    pass
+
+# Load data from storage
 def load_milestone_projects():
-    if MILESTONE_PROJECTS_FILE.exists():
-        with open(MILESTONE_PROJECTS_FILE, 'r') as f:
-            return json.load(f)
-    return []
+    return get_storage().load(MILESTONE_PROJECTS)
 
 def load_small_projects():
-    if SMALL_PROJECTS_FILE.exists():
-        with open(SMALL_PROJECTS_FILE, 'r') as f:
-            return json.load(f)
-    return []
+    return get_storage().load(SMALL_PROJECTS)
 
 def load_timeline_events():
-    if TIMELINE_EVENTS_FILE.exists():
-        with open(TIMELINE_EVENTS_FILE, 'r') as f:
-            return json.load(f)
-    return []
+    return get_storage().load(TIMELINE_EVENTS)
+
+# Shared photo cache
+# Photo bytes live in one process-wide LRU cache; sessions only keep a
+# manifest of photo key -> file metadata.
+PHOTO_CACHE_MAX_BYTES = int(os.environ.get("PORTFOLIO_PHOTO_CACHE_MB", "64")) * 1024 * 1024
+
+class PhotoCache:
+    """Thread-safe LRU cache of photo bytes bounded by a byte budget"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        # Photos larger than the whole budget are served straight from disk
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.current_bytes -= len(old)
+            self._items[key] = data
+            self.current_bytes += len(data)
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def discard(self, key):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.current_bytes -= len(old)
+
+@st.cache_resource
+def get_photo_cache():
+    return PhotoCache(PHOTO_CACHE_MAX_BYTES)
+
+def photo_entry(path, digest=None):
+    """Describe a stored photo without reading its contents"""
+    return {"path": str(path), "ext": Path(path).suffix, "digest": digest}
+
+def _photo_cache_key(entry):
+    # Stored photos are never modified in place, so the path identifies the bytes
+    return entry["path"]
+
+@timed("photo.bytes")
+def get_photo_bytes(entry):
+    """Return the bytes of a photo, reading from disk on a cache miss"""
+    cache = get_photo_cache()
+    cache_key = _photo_cache_key(entry)
+    data = cache.get(cache_key)
+    if data is None:
+        with open(entry["path"], 'rb') as f:
+            data = f.read()
+        cache.put(cache_key, data)
+    return data
+
+# Content-addressed photo store
+# Photo files live in photos/objects/, named by the SHA-256 of their bytes, so
+# an image uploaded for several records is stored once. An index maps each
+# record's photo to its object and counts references per object; an object
+# is deleted when the last record using it lets go.
+PHOTO_OBJECTS_DIR = PHOTOS_DIR / "objects"
+PHOTO_INDEX_FILE = PHOTOS_DIR / "index.db"
+PHOTO_LOCK_FILE = PHOTOS_DIR / ".lock"
+PHOTO_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+
+class PhotoStore:
+    """SQLite index of record photos -> content-addressed objects
+
+    Object files are created and removed under a file lock, so workers
+    sharing the data directory agree on reference counts.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS photo_refs (
+            section TEXT NOT NULL,
+            key TEXT NOT NULL,
+            object TEXT NOT NULL,
+            PRIMARY KEY (section, key)
+        );
+        CREATE TABLE IF NOT EXISTS photo_objects (
+            object TEXT PRIMARY KEY,
+            refs INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, objects_dir, index_file, lock_file):
+        self.objects_dir = objects_dir
+        self.lock_file = lock_file
+        objects_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(index_file, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock, FileLock(lock_file), self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+
+    def _entry(self, name):
+        return photo_entry(self.objects_dir / name, Path(name).stem)
+
+    def _acquire(self, name):
+        self._conn.execute(
+            "INSERT INTO photo_objects (object, refs) VALUES (?, 1) "
+            "ON CONFLICT (object) DO UPDATE SET refs = refs + 1",
+            (name,)
+        )
+
+    def _release(self, name):
+        """Drop one reference; returns True if nothing uses the object any more"""
+        self._conn.execute("UPDATE photo_objects SET refs = refs - 1 WHERE object = ?", (name,))
+        return self._conn.execute("DELETE FROM photo_objects WHERE object = ? AND refs <= 0", (name,)).rowcount > 0
+
+    def _bump(self):
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('version', 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1"
+        )
+
+    def version(self):
+        """Change counter covering every section, bumped by any worker"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return row[0] if row else 0
+
+    @timed("photos.index")
+    def entries(self, section):
+        """Map a section's photo keys to their object entries"""
+        with self._lock:
+            rows = self._conn.execute("SELECT key, object FROM photo_refs WHERE section = ?", (section,)).fetchall()
+        return {key: self._entry(name) for key, name in rows}
+
+    @timed("photos.put")
+    def put(self, section, key, photo_data, file_extension):
+        """Set a record's photo; returns (entry, entry of an object that was deleted or None)"""
+        name = f"{hashlib.sha256(photo_data).hexdigest()}{file_extension.lower()}"
+        with self._lock, FileLock(self.lock_file):
+            target = self.objects_dir / name
+            if not target.exists():
+                atomic_write(target, photo_data)
+            with self._conn:
+                row = self._conn.execute(
+                    "SELECT object FROM photo_refs WHERE section = ? AND key = ?", (section, key)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO photo_refs (section, key, object) VALUES (?, ?, ?)", (section, key, name)
+                )
+                # Take the new reference first so re-saving the same image keeps it
+                self._acquire(name)
+                orphaned = row is not None and self._release(row[0])
+                self._bump()
+            if orphaned:
+                (self.objects_dir / row[0]).unlink(missing_ok=True)
+        return self._entry(name), self._entry(row[0]) if orphaned else None
+
+    @timed("photos.remove")
+    def remove(self, section, key):
+        """Drop a record's photo; returns the object's entry if it was deleted"""
+        with self._lock, FileLock(self.lock_file):
+            with self._conn:
+                row = self._conn.execute(
+                    "SELECT object FROM photo_refs WHERE section = ? AND key = ?", (section, key)
+                ).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute("DELETE FROM photo_refs WHERE section = ? AND key = ?", (section, key))
+                orphaned = self._release(row[0])
+                self._bump()
+            if not orphaned:
+                return None
+            (self.objects_dir / row[0]).unlink(missing_ok=True)
+        return self._entry(row[0])
+
+@st.cache_resource
+def get_photo_store():
+    return PhotoStore(PHOTO_OBJECTS_DIR, PHOTO_INDEX_FILE, PHOTO_LOCK_FILE)
 
 def load_timeline_photos():
-    """Load timeline photos from disk"""
-    photos = {}
-    if PHOTOS_DIR.exists():
-        for photo_file in PHOTOS_DIR.glob("*"):
-            if photo_file.is_file():
-                with open(photo_file, 'rb') as f:
-                    photos[photo_file.stem] = f.read()
-    return photos
+    """Load the timeline photo manifest"""
+    return get_photo_store().entries("timeline")
 
 def load_milestone_photos():
-    """Load milestone project photos from disk"""
-    photos = {}
-    if MILESTONE_PHOTOS_DIR.exists():
-        for photo_file in MILESTONE_PHOTOS_DIR.glob("*"):
-            if photo_file.is_file():
-                with open(photo_file, 'rb') as f:
-                    photos[photo_file.stem] = f.read()
-    return photos
+    """Load the milestone project photo manifest"""
+    return get_photo_store().entries("milestone")
 
 def load_small_photos():
-    """Load small project photos from disk"""
-    photos = {}
-    if SMALL_PHOTOS_DIR.exists():
-        for photo_file in SMALL_PHOTOS_DIR.glob("*"):
-            if photo_file.is_file():
-                with open(photo_file, 'rb') as f:
-                    photos[photo_file.stem] = f.read()
-    return photos
+    """Load the small project photo manifest"""
+    return get_photo_store().entries("small")
 
-# Initialize session state with persistent data
-if 'milestone_projects' not in st.session_state:
-    st.session_state.milestone_projects = load_milestone_projects()
-
-if 'small_projects' not in st.session_state:
-    st.session_state.small_projects = load_small_projects()
-
-if 'timeline_events' not in st.session_state:
-    st.session_state.timeline_events = load_timeline_events()
-
-if 'timeline_photos' not in st.session_state:
-    st.session_state.timeline_photos = load_timeline_photos()
-
-if 'milestone_photos' not in st.session_state:
-    st.session_state.milestone_photos = load_milestone_photos()
-
-if 'small_photos' not in st.session_state:
-    st.session_state.small_photos = load_small_photos()
-
-# Save functions
-def save_milestone_projects():
-    with open(MILESTONE_PROJECTS_FILE, 'w') as f:
-        json.dump(st.session_state.milestone_projects, f, indent=2)
-
-def save_small_projects():
-    with open(SMALL_PROJECTS_FILE, 'w') as f:
-        json.dump(st.session_state.small_projects, f, indent=2)
-
-def save_timeline_events():
-    with open(TIMELINE_EVENTS_FILE, 'w') as f:
-        json.dump(st.session_state.timeline_events, f, indent=2)
-
-def save_timeline_photo(event_key, photo_data, file_extension):
-    """Save timeline photo to disk"""
-    photo_file = PHOTOS_DIR / f"{event_key}{file_extension}"
-    with open(photo_file, 'wb') as f:
-        f.write(photo_data)
-
-def delete_timeline_photo(event_key):
-    """Delete timeline photo from disk"""
-    # Try common image extensions
-    for ext in ['.jpg', '.jpeg', '.png', '.gif']:
-        photo_file = PHOTOS_DIR / f"{event_key}{ext}"
-        if photo_file.exists():
-            photo_file.unlink()
-            break
-
-def save_milestone_photo(project_key, photo_data, file_extension):
-    """Save milestone project photo to disk"""
-    photo_file = MILESTONE_PHOTOS_DIR / f"{project_key}{file_extension}"
-    with open(photo_file, 'wb') as f:
-        f.write(photo_data)
-
-def delete_milestone_photo(project_key):
-    """Delete milestone project photo from disk"""
-    for ext in ['.jpg', '.jpeg', '.png', '.gif']:
-        photo_file = MILESTONE_PHOTOS_DIR / f"{project_key}{ext}"
-        if photo_file.exists():
-            photo_file.unlink()
-            break
-
-def save_small_photo(project_key, photo_data, file_extension):
-    """Save small project photo to disk"""
-    photo_file = SMALL_PHOTOS_DIR / f"{project_key}{file_extension}"
-    with open(photo_file, 'wb') as f:
-        f.write(photo_data)
-
-def delete_small_photo(project_key):
-    """Delete small project photo from disk"""
-    for ext in ['.jpg', '.jpeg', '.png', '.gif']:
-        photo_file = SMALL_PHOTOS_DIR / f"{project_key}{ext}"
-        if photo_file.exists():
-            photo_file.unlink()
-            break
+# Data URI encoding
+# By default cards inline their thumbnails as data: URIs. Encoded URIs are
+# cached by content hash so a rerun does not base64-encode the same image again.
+DATA_URI_CACHE_MAX_BYTES = int(os.environ.get("PORTFOLIO_DATA_URI_CACHE_MB", "16")) * 1024 * 1024
 
-# Rich Text Editor Helper
-def create_rich_text_editor(label, value="", key_prefix=""):
-    """Create a rich text editor with formatting options"""
-    st.markdown(f"**{label}**")
-    
-    # Create three tabs: Direct Input, File Upload, and Preview
-    tab1, tab2, tab3 = st.tabs(["✏️ Text Input", "📄 Upload File", "👁️ Preview"])
-    
-    with tab1:
-        # Text input with formatting guide
-        st.caption("💡 Formatting tips: Use **bold**, *italic*, - for bullets, 1. for numbers")
-        text_input = st.text_area(
-            label="Enter description (supports Markdown formatting)",
-            value=value,
-            height=200,
-            label_visibility="collapsed",
-            key=f"{key_prefix}_text_input"
-        )
-    
-    with tab2:
-        uploaded_text_file = st.file_uploader(
-            "Upload a .txt file",
-            type=["txt"],
-            key=f"{key_prefix}_file_upload"
-        )
-        text_from_file = ""
-        if uploaded_text_file is not None:
-            text_from_file = uploaded_text_file.getvalue().decode("utf-8")
-            st.caption("✅ File loaded successfully")
-    
-    with tab3:
-        # Show formatted preview
-        combined_text = text_from_file if text_from_file else text_input
-        st.markdown("### Preview")
-        st.markdown(combined_text if combined_text else "*No content yet*")
-    
-    # Return the final text (prefer file input if available)
-    final_text = text_from_file if text_from_file else text_input
-    return final_text
+_IMAGE_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+]
 
-# Custom CSS - Retro Macintosh Minimalistic Style
-st.markdown("""
-<style>
+def detect_image_mime(data):
+    """Detect an image MIME type from its magic bytes"""
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, mime in _IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return mime
+    return "application/octet-stream"
+
+@st.cache_resource
+def get_photo_digests():
+    # photo cache key -> SHA-256 of the file contents
+    return {}
+
+def photo_digest(entry, data=None):
+    """Content hash of a photo, computed once per file"""
+    if entry.get("digest"):
+        return entry["digest"]
+    digests = get_photo_digests()
+    cache_key = _photo_cache_key(entry)
+    digest = digests.get(cache_key)
+    if digest is None:
+        if data is None:
+            data = get_photo_bytes(entry)
+        digest = hashlib.sha256(data).hexdigest()
+        digests[cache_key] = digest
+    return digest
+
+class DataUriCache:
+    """Ready-made data: URIs keyed by content hash"""
+
+    def __init__(self, max_bytes):
+        self._uris = PhotoCache(max_bytes)
+
+    def get(self, entry):
+        digest = photo_digest(entry)
+        uri = self._uris.get(digest)
+        if uri is None:
+            data = get_photo_bytes(entry)
+            uri = f"data:{detect_image_mime(data)};base64,{base64.b64encode(data).decode()}"
+            self._uris.put(digest, uri)
+        return uri
+
+    def invalidate(self, digest):
+        self._uris.discard(digest)
+
+@st.cache_resource
+def get_data_uri_cache():
+    return DataUriCache(DATA_URI_CACHE_MAX_BYTES)
+
+@timed("photo.data_uri")
+def photo_data_uri(entry):
+    return get_data_uri_cache().get(entry)
+
+def forget_photo(entry):
+    """Drop a photo that is about to be replaced or removed from every cache"""
+    cache_key = _photo_cache_key(entry)
+    get_photo_cache().discard(cache_key)
+    digest = get_photo_digests().pop(cache_key, None)
+    if digest is not None:
+        get_data_uri_cache().invalidate(digest)
+
+# Static photo serving
+# In "static" mode photos are published to the app's static folder under
+# content-hashed names, so browsers fetch and cache them by URL instead of
+# receiving the bytes through the websocket on every rerun.
+PHOTO_MODE = os.environ.get("PORTFOLIO_PHOTO_MODE", "inline")
+STATIC_PHOTOS_DIR = Path(__file__).parent / "static" / "photos"
+STATIC_PHOTOS_URL = os.environ.get("PORTFOLIO_STATIC_URL", "/app/static/photos").rstrip("/")
+
+@st.cache_resource
+def get_published_photos():
+    return set()
+
+@timed("photo.publish")
+def publish_photo(entry):
+    """Copy a photo into the static folder under its content hash and return its URL"""
+    filename = f"{photo_digest(entry)[:32]}{entry['ext'].lower()}"
+    published = get_published_photos()
+    if filename not in published:
+        target = STATIC_PHOTOS_DIR / filename
+        if not target.exists():
+            STATIC_PHOTOS_DIR.mkdir(parents=True, exist_ok=True)
+            atomic_write(target, get_photo_bytes(entry))
+        published.add(filename)
+    return f"{STATIC_PHOTOS_URL}/{filename}"
+
+def unpublish_photo(entry):
+    """Remove a photo's published copy, so its old URL stops serving it"""
+    if not STATIC_PHOTOS_DIR.exists():
+        return
+    filename = f"{photo_digest(entry)[:32]}{entry['ext'].lower()}"
+    get_published_photos().discard(filename)
+    (STATIC_PHOTOS_DIR / filename).unlink(missing_ok=True)
+
+def photo_src(entry):
+    """Image source for a photo: a static URL or an inline data URI"""
+    if PHOTO_MODE == "static":
+        return publish_photo(entry)
+    return photo_data_uri(entry)
+
+# Project card thumbnails
+# Cards show photos at 60x60, so they get a small WebP variant stored in a
+# "thumbs" folder next to the photo objects (2x size for high-DPI screens).
+# Thumbnails are named by the photo's hash, so identical photos share one.
+THUMBNAIL_SIZE = (120, 120)
+THUMBNAIL_DIRNAME = "thumbs"
+
+def thumbnail_file(entry):
+    return PHOTO_OBJECTS_DIR / THUMBNAIL_DIRNAME / f"{entry['digest']}.webp"
+
+def generate_thumbnail(photo_data, thumb_file):
+    """Write a cropped, compressed thumbnail; returns its manifest entry or None"""
+    from PIL import Image, ImageOps
+    try:
+        with Image.open(io.BytesIO(photo_data)) as img:
+            img = ImageOps.exif_transpose(img)
+            img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+            thumb = ImageOps.fit(img, THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+    buffer = io.BytesIO()
+    thumb.save(buffer, "WEBP", quality=80, method=4)
+    thumb_file.parent.mkdir(exist_ok=True)
+    atomic_write(thumb_file, buffer.getvalue())
+    return photo_entry(thumb_file)
+
+@timed("photo.thumbnail")
+def get_thumbnail(entry):
+    """Return the thumbnail entry for a photo, generating it if missing"""
+    thumb = thumbnail_file(entry)
+    if thumb.exists():
+        return photo_entry(thumb)
+    return generate_thumbnail(get_photo_bytes(entry), thumb)
+
+def delete_thumbnail(entry):
+    thumb = thumbnail_file(entry)
+    if thumb.exists():
+        unpublish_photo(photo_entry(thumb))
+        forget_photo(photo_entry(thumb))
+        thumb.unlink()
+
+# Timeline image variants
+# Timeline photos fill most of the page width, so each one also gets copies
+# at a few widths, stored next to the thumbnails and named by the photo's
+# hash. Static pages list them in a srcset so the browser downloads the
+# smallest one that fills the column; inline mode sends the variant for a
+# typical desktop column. Photos narrower than a width are not enlarged.
+# Variants are JPEGs, which st.image passes through as they are; it would
+# re-encode WebP on every run.
+TIMELINE_WIDTHS = (480, 960, 1440)
+TIMELINE_INLINE_WIDTH = 960
+# Streamlit stacks columns below 640px; otherwise the photo column is about 3/4 of the page
+TIMELINE_SIZES = "(max-width: 640px) 100vw, 75vw"
+VARIANT_DIRNAME = "variants"
+
+def variant_file(entry, width):
+    return PHOTO_OBJECTS_DIR / VARIANT_DIRNAME / f"{entry['digest']}-{width}.jpg"
+
+@st.cache_resource
+def get_image_variants():
+    """Photo digest -> [(width, entry)], smallest first"""
+    return {}
+
+def generate_variants(entry):
+    """Write the missing variants of a photo; returns [(width, entry)] with the original last if it is small"""
+    from PIL import Image, ImageOps
+    variants = []
+    try:
+        with Image.open(io.BytesIO(get_photo_bytes(entry))) as img:
+            if getattr(img, "is_animated", False):
+                # Animated GIFs are only shown as uploaded
+                return []
+            img = ImageOps.exif_transpose(img)
+            if "A" in img.getbands() or "transparency" in img.info:
+                # JPEG has no alpha channel, so transparent areas become white
+                rgba = img.convert("RGBA")
+                img = Image.new("RGB", rgba.size, "white")
+                img.paste(rgba, mask=rgba.getchannel("A"))
+            else:
+                img = img.convert("RGB")
+            for width in TIMELINE_WIDTHS:
+                if width >= img.width:
+                    variants.append((img.width, entry))
+                    break
+                target = variant_file(entry, width)
+                if not target.exists():
+                    resized = img.resize((width, max(1, round(img.height * width / img.width))), Image.Resampling.LANCZOS)
+                    buffer = io.BytesIO()
+                    resized.save(buffer, "JPEG", quality=82, optimize=True, progressive=True)
+                    target.parent.mkdir(exist_ok=True)
+                    atomic_write(target, buffer.getvalue())
+                variants.append((width, photo_entry(target)))
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return []
+    return variants
+
+@timed("photo.variants")
+def image_variants(entry):
+    """The resolution variants of a timeline photo, generating any that are missing"""
+    cache = get_image_variants()
+    variants = cache.get(entry['digest'])
+    if variants is None:
+        files = [variant_file(entry, width) for width in TIMELINE_WIDTHS]
+        if all(f.exists() for f in files):
+            variants = [(width, photo_entry(f)) for width, f in zip(TIMELINE_WIDTHS, files)]
+        else:
+            variants = generate_variants(entry)
+        cache[entry['digest']] = variants
+    return variants
+
+def inline_variant(entry):
+    """The smallest variant at least TIMELINE_INLINE_WIDTH wide, else the largest one"""
+    variants = image_variants(entry)
+    for width, variant in variants:
+        if width >= TIMELINE_INLINE_WIDTH:
+            return variant
+    return variants[-1][1] if variants else entry
+
+def srcset(variants, url):
+    return ", ".join(f"{url(variant)} {width}w" for width, variant in variants)
+
+def delete_variants(entry):
+    get_image_variants().pop(entry['digest'], None)
+    for width in TIMELINE_WIDTHS:
+        target = variant_file(entry, width)
+        if target.exists():
+            unpublish_photo(photo_entry(target))
+            forget_photo(photo_entry(target))
+            target.unlink()
+
+# Photo store migration
+# Photos used to be files in per-section folders, named "{title}" (projects)
+# or "{date}_{title}" (events) and later by record id. They are moved into
+# the photo store once; files that match no record are left in place.
+def _migrate_photo_files(section, photo_dir, collection, legacy_key):
+    files = {}
+    with os.scandir(photo_dir) as it:
+        for dir_entry in it:
+            photo_file = Path(dir_entry.path)
+            if dir_entry.is_file() and photo_file.suffix.lower() in PHOTO_EXTENSIONS:
+                files[photo_file.stem] = photo_file
+    if not files:
+        return
+    store = get_photo_store()
+    migrated = set()
+    for record in get_storage().load(collection):
+        # Records with duplicate titles share one stored object
+        photo_file = files.get(record["id"]) or files.get(legacy_key(record))
+        if photo_file is None:
+            continue
+        with open(photo_file, 'rb') as f:
+            store.put(section, record["id"], f.read(), photo_file.suffix)
+        migrated.add(photo_file)
+    for photo_file in migrated:
+        photo_file.unlink(missing_ok=True)
+    shutil.rmtree(photo_dir / THUMBNAIL_DIRNAME, ignore_errors=True)
+
+def migrate_photo_files():
+    """Move legacy photo files into the photo store"""
+    _migrate_photo_files("milestone", MILESTONE_PHOTOS_DIR, MILESTONE_PROJECTS, lambda p: p["title"])
+    _migrate_photo_files("small", SMALL_PHOTOS_DIR, SMALL_PROJECTS, lambda p: p["title"])
+    _migrate_photo_files("timeline", PHOTOS_DIR, TIMELINE_EVENTS, lambda e: f"{e['date']}_{e['title']}")
+
+def index_records(records):
+    """Index records by id; dicts keep insertion order for display"""
+    return {record["id"]: record for record in records}
+
+# One-time initialization
+# Creating the data folders and upgrading data saved by older versions
+# happens once per process instead of on every script run.
+@st.cache_resource(show_spinner=False)
+def initialize_data():
+    for folder in (DATA_DIR, PHOTOS_DIR, MILESTONE_PHOTOS_DIR, SMALL_PHOTOS_DIR, UPLOADS_DIR):
+        folder.mkdir(exist_ok=True)
+    # Uploads left behind by a process that stopped; other processes' are recent
+    for leftover in UPLOADS_DIR.iterdir():
+        try:
+            if leftover.stat().st_mtime < time.time() - 24 * 3600:
+                leftover.unlink()
+        except FileNotFoundError:
+            # Processed and removed by another worker meanwhile
+            continue
+    migrate_photo_files()
+    compile_stored_descriptions()
+    return True
+
+initialize_data()
+
+# Portfolio archives
+# An archive is a gzipped tar stream: "format", then "records.ndjson" with
+# one {"collection", "record", "photo"} object per line, then one
+# "photos/<sha256><ext>" member per distinct photo. Both directions stream:
+# export spools the record lines to a temp file and copies photos straight
+# from the store, and import reads lines and members one at a time and
+# writes records in batches. Imported records get new ids, so importing
+# never overwrites existing data.
+ARCHIVE_FORMAT = "portfolio-archive/1"
+ARCHIVE_RECORDS = "records.ndjson"
+ARCHIVE_BATCH_SIZE = 500
+ARCHIVE_MAX_PHOTO_BYTES = 32 * 1024 * 1024
+ARCHIVE_SECTIONS = {MILESTONE_PROJECTS: "milestone", SMALL_PROJECTS: "small", TIMELINE_EVENTS: "timeline"}
+ARCHIVE_SKIPPED_FIELDS = {"version", "description_html", "description_hash"}
+
+def _add_archive_member(tar, name, fileobj, size):
+    import tarfile
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = int(time.time())
+    tar.addfile(info, fileobj)
+
+def export_archive(fileobj):
+    """Write all records and photos to an archive stream; returns (records, photos) written"""
+    import tarfile
+    storage = get_storage()
+    store = get_photo_store()
+    photo_files = {}
+    exported = 0
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as records_file:
+        for collection, section in ARCHIVE_SECTIONS.items():
+            photos = store.entries(section)
+            for record in storage.load(collection):
+                line = {
+                    "collection": collection,
+                    "record": {k: v for k, v in record.items() if k not in ARCHIVE_SKIPPED_FIELDS}
+                }
+                entry = photos.get(record["id"])
+                if entry is not None:
+                    member = f"photos/{Path(entry['path']).name}"
+                    photo_files[member] = entry["path"]
+                    line["photo"] = member
+                records_file.write((json.dumps(line) + "\n").encode("utf-8"))
+                exported += 1
+        with tarfile.open(fileobj=fileobj, mode="w|gz") as tar:
+            _add_archive_member(tar, "format", io.BytesIO(ARCHIVE_FORMAT.encode()), len(ARCHIVE_FORMAT))
+            size = records_file.tell()
+            records_file.seek(0)
+            _add_archive_member(tar, ARCHIVE_RECORDS, records_file, size)
+            for member, path in photo_files.items():
+                with open(path, 'rb') as f:
+                    _add_archive_member(tar, member, f, os.fstat(f.fileno()).st_size)
+    return exported, len(photo_files)
+
+def _archive_text(value):
+    return value if isinstance(value, str) else ""
+
+def archive_record(collection, record):
+    """Build a new, validated record from an archive line, or None if it is unusable"""
+    if collection not in ARCHIVE_SECTIONS or not isinstance(record, dict):
+        return None
+    title = _archive_text(record.get("title")).strip()
+    if not title:
+        return None
+    imported = {"id": new_record_id(), "title": title, "description": _archive_text(record.get("description"))}
+    if collection == TIMELINE_EVENTS:
+        try:
+            imported["date"] = datetime.strptime(_archive_text(record.get("date")), '%Y-%m-%d').strftime('%Y-%m-%d')
+        except ValueError:
+            return None
+    else:
+        technologies = record.get("technologies")
+        # Dates the app cannot have written show as "N/A", like a missing one
+        try:
+            imported["release_date"] = datetime.strptime(_archive_text(record.get("release_date")), '%Y-%m-%d').strftime('%Y-%m-%d')
+        except ValueError:
+            imported["release_date"] = "N/A"
+        imported["technologies"] = [t for t in technologies if isinstance(t, str)] if isinstance(technologies, list) else []
+        imported["link"] = _archive_text(record.get("link"))
+    # Stored HTML is never trusted; descriptions are compiled again
+    compile_description(imported)
+    return imported
+
+def import_archive(fileobj, batch_size=ARCHIVE_BATCH_SIZE):
+    """Add the records and photos in an archive stream; returns counts of what was imported"""
+    import tarfile
+    storage = get_storage()
+    store = get_photo_store()
+    summary = {"records": 0, "photos": 0, "skipped": 0}
+    batches = {collection: [] for collection in ARCHIVE_SECTIONS}
+    # Archive photo member -> (section, new record id) of the records using it
+    waiting = {}
+
+    def flush(collection):
+        if batches[collection]:
+            storage.insert_many(collection, batches[collection])
+            summary["records"] += len(batches[collection])
+            batches[collection] = []
+
+    try:
+        with tarfile.open(fileobj=fileobj, mode="r|*") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                if member.name == "format":
+                    archive_format = tar.extractfile(member).read().decode("utf-8", "replace").strip()
+                    if archive_format != ARCHIVE_FORMAT:
+                        raise ValueError(f"Unsupported archive format: {archive_format!r}")
+                elif member.name == ARCHIVE_RECORDS:
+                    for line in tar.extractfile(member):
+                        try:
+                            item = json.loads(line)
+                            collection = item["collection"]
+                            record = archive_record(collection, item["record"])
+                        except (ValueError, KeyError, TypeError):
+                            record = None
+                        if record is None:
+                            summary["skipped"] += 1
+                            continue
+                        batches[collection].append(record)
+                        if isinstance(item.get("photo"), str):
+                            waiting.setdefault(item["photo"], []).append((ARCHIVE_SECTIONS[collection], record["id"]))
+                        if len(batches[collection]) >= batch_size:
+                            flush(collection)
+                    for collection in batches:
+                        flush(collection)
+                elif member.name in waiting:
+                    users = waiting.pop(member.name)
+                    extension = Path(member.name).suffix.lower()
+                    if member.size > ARCHIVE_MAX_PHOTO_BYTES or extension not in PHOTO_EXTENSIONS:
+                        continue
+                    photo_data = tar.extractfile(member).read()
+                    if detect_image_mime(photo_data) == "application/octet-stream":
+                        continue
+                    for section, record_id in users:
+                        store.put(section, record_id, photo_data, extension)
+                    summary["photos"] += 1
+    except tarfile.TarError as e:
+        raise ValueError(f"Not a valid archive: {e}") from e
+    return summary
+
+# Page content
+# The stylesheet, about text and contact details are shared by the app and
+# the static site export.
+SITE_TITLE = "🚀 My Portfolio"
+
+# Retro Macintosh Minimalistic Style
+PORTFOLIO_CSS = """
     .main-header {
         font-size: 2rem;
         font-weight: bold;
@@ -278,469 +1975,1230 @@ st.markdown("""
         font-family: 'Monaco', 'Courier New', monospace;
         font-size: 0.85rem;
     }
-</style>
-""", unsafe_allow_html=True)
-
-# Main header
-st.markdown('<div class="main-header">🚀 My Portfolio</div>', unsafe_allow_html=True)
+"""
 
-# About section
-st.markdown('<div class="section-header">👋 About Me</div>', unsafe_allow_html=True)
-st.write("""
+ABOUT_MARKDOWN = """
 Hello! I'm **Isaac Ng**, a passionate learning enthusiast with a strong interest in **Machine Learning and Deep Learning**.
 I love exploring innovative solutions and documenting my learning journey.
 This portfolio showcases my milestone projects, fundamental experiments, and my learning timeline with visual memories.
-""")
+"""
 
-# Milestone Projects section
-st.markdown('<div class="section-header">Projects</div>', unsafe_allow_html=True)
+CONTACT_INTRO = "Reach out for collaborations or opportunities."
+# (icon, label, text, link)
+CONTACT_ITEMS = [
+    ("✉️", "Name", "Isaac Ng", None),
+    ("🖥️", "GitHub", "Kgoing1", "https://github.com/Kgoing1"),
+    ("🚀", "Focus", "ML/DL Learning", None)
+]
 
-# Form to add milestone projects
-with st.expander("+ Add Project"):
-    with st.form("milestone_form"):
-        title = st.text_input("Project Title")
-        release_date = st.date_input("Release Date", value=datetime.now().date())
-        description = create_rich_text_editor("Project Description", key_prefix="milestone_desc")
-        technologies = st.text_input("Technologies (comma-separated)")
-        link = st.text_input("Project Link")
-        image = st.file_uploader("Upload a photo", type=["jpg", "jpeg", "png", "gif"], key="milestone_photo")
-        submitted = st.form_submit_button("Add Project")
-
-        if submitted and title:
-            new_project = {
-                "title": title,
-                "release_date": release_date.strftime('%Y-%m-%d'),
-                "description": description,
-                "technologies": [tech.strip() for tech in technologies.split(',') if tech.strip()],
-                "link": link
-            }
-            st.session_state.milestone_projects.append(new_project)
-            save_milestone_projects()
-            
-            # Store photo if uploaded
-            if image:
-                project_key = title
-                file_ext = Path(image.name).suffix
-                photo_data = image.getvalue()
-                st.session_state.milestone_photos[project_key] = photo_data
-                save_milestone_photo(project_key, photo_data, file_ext)
-            
-            st.success("Project added successfully!")
+PROJECT_SECTIONS = {
+    "milestone": {
+        "collection": MILESTONE_PROJECTS,
+        "heading": "h3",
+        "link_label": "🔗 View Project",
+        "form_prefix": "m"
+    },
+    "small": {
+        "collection": SMALL_PROJECTS,
+        "heading": "h4",
+        "link_label": "🔗 View Code",
+        "form_prefix": "s"
+    }
+}
 
-# Display milestone projects
-if st.session_state.milestone_projects:
-    for idx, project in enumerate(st.session_state.milestone_projects):
-        project_key = project['title']
-        release_date_str = project.get('release_date', 'N/A')
-        if release_date_str != 'N/A':
+def month_label(value):
+    """Format a YYYY-MM-DD date as "Month YYYY", or return it unchanged"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').strftime('%B %Y')
+    except (TypeError, ValueError):
+        return value
+
+# Static site export
+# `python streamlit_app.py site DIRECTORY` renders the portfolio to plain
+# HTML for static hosting. Pages hold SITE_PAGE_SIZE items each; assets are
+# named by content hash, so they can be cached forever, and are only copied
+# when missing. A manifest in the output folder records a fingerprint of
+# each page's inputs, so a later export rewrites only the pages whose
+# records or photos changed and deletes files it wrote that are now unused.
+SITE_FORMAT = 1
+SITE_MANIFEST = ".portfolio-site.json"
+SITE_PAGE_SIZE = 50
+SITE_ASSETS = "assets"
+# Pages are at most 860px wide, so timeline photos never need more than that
+SITE_IMAGE_SIZES = "(max-width: 860px) 100vw, 800px"
+# (file name prefix, heading, collection, photo section)
+SITE_SECTIONS = [
+    ("projects", "Projects", MILESTONE_PROJECTS, "milestone"),
+    ("fundamental", "Fundamental Projects", SMALL_PROJECTS, "small"),
+    ("timeline", "Learning Timeline", TIMELINE_EVENTS, "timeline")
+]
+
+# Layout the Streamlit page would otherwise provide
+SITE_CSS = """
+    body { max-width: 860px; margin: 0 auto; padding: 1rem; font-family: 'Monaco', 'Courier New', monospace; line-height: 1.5; }
+    .main-header a { color: inherit; text-decoration: none; }
+    .site-nav { text-align: center; margin-bottom: 1rem; }
+    .site-nav a { margin: 0 0.5rem; color: #000; }
+    .site-nav a[aria-current] { font-weight: bold; text-decoration: none; }
+    .card-title { display: flex; align-items: center; margin-bottom: 10px; }
+    .card-title img { height: 60px; width: 60px; object-fit: cover; border-radius: 5px; margin-right: 10px; }
+    .card-title h3, .card-title h4 { margin: 0; }
+    .card-body { border: 2px solid #000; border-top: none; padding: 10px; margin: -1rem 0 1rem; }
+    .card-body a { color: #0066cc; text-decoration: none; font-weight: bold; }
+    .timeline-item img { max-width: 100%; height: auto; display: block; margin-top: 0.5rem; }
+    .pages { text-align: center; }
+    .contact { display: flex; flex-wrap: wrap; gap: 1rem 3rem; }
+    .contact span { color: #666; }
+"""
+
+def site_page_name(prefix, page):
+    return f"{prefix}.html" if page == 0 else f"{prefix}-{page + 1}.html"
+
+def _site_link(href, label, current):
+    marker = ' aria-current="page"' if href == current else ""
+    return f'<a href="{href}"{marker}>{html.escape(label)}</a>'
+
+def _site_document(title, current, body, css_url):
+    nav = " ".join(
+        _site_link(name, label, current)
+        for name, label in [("index.html", "About")] + [(site_page_name(prefix, 0), heading) for prefix, heading, _, _ in SITE_SECTIONS]
+    )
+    contact = "".join(
+        f'<div>{icon} <span>{html.escape(label)}:</span> '
+        + (f'<a href="{html.escape(safe_url(link))}">{html.escape(text)}</a>' if link else html.escape(text))
+        + '</div>'
+        for icon, label, text, link in CONTACT_ITEMS
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)} · {html.escape(SITE_TITLE)}</title>
+<link rel="stylesheet" href="{css_url}">
+</head>
+<body>
+<div class="main-header"><a href="index.html">{html.escape(SITE_TITLE)}</a></div>
+<nav class="site-nav">{nav}</nav>
+<main>
+<div class="section-header">{html.escape(title)}</div>
+{body}
+</main>
+<footer>
+<hr>
+<h3>Contact</h3>
+<p>{html.escape(CONTACT_INTRO)}</p>
+<div class="contact">{contact}</div>
+</footer>
+</body>
+</html>
+"""
+
+def _site_project(section, project, photo_url):
+    config = PROJECT_SECTIONS[section]
+    heading = config["heading"]
+    photo = f'<img src="{photo_url}" alt="" width="60" height="60" loading="lazy">' if photo_url else ""
+    return f"""<article>
+<div class="project-card">
+<div class="card-title">{photo}<{heading}>{html.escape(project['title'])}</{heading}></div>
+<p><strong>Released:</strong> {html.escape(month_label(project.get('release_date', 'N/A')))}</p>
+<p><strong>Technologies:</strong> {html.escape(', '.join(project['technologies']))}</p>
+</div>
+<div class="card-body">
+<div>{description_html(project)}</div>
+<a href="{html.escape(safe_url(project['link']))}" target="_blank" rel="noopener">{config["link_label"]}</a>
+</div>
+</article>"""
+
+def _site_event(event, photo):
+    """Timeline item; photo is (fallback URL, srcset) or None"""
+    if photo is None:
+        photo = ""
+    elif photo[1]:
+        photo = f'<img src="{photo[0]}" srcset="{photo[1]}" sizes="{SITE_IMAGE_SIZES}" alt="" loading="lazy">'
+    else:
+        photo = f'<img src="{photo[0]}" alt="" loading="lazy">'
+    return f"""<article class="timeline-item">
+<div class="timeline-date">{html.escape(month_label(event['date']))}</div>
+<h4>{html.escape(event['title'])}</h4>
+<div>{description_html(event)}</div>
+{photo}
+</article>"""
+
+def _site_pagination(prefix, page, page_count):
+    if page_count <= 1:
+        return ""
+    current = site_page_name(prefix, page)
+    links = [_site_link(site_page_name(prefix, i), str(i + 1), current) for i in range(page_count)]
+    return f'<nav class="pages site-nav">{" ".join(links)}</nav>'
+
+def _site_fingerprint(*parts):
+    return hashlib.sha256(json.dumps([SITE_FORMAT, *parts], sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def export_site(out_dir, full=False):
+    """Render the portfolio to out_dir; returns counts of files written, unchanged and removed"""
+    out_dir = Path(out_dir)
+    (out_dir / SITE_ASSETS).mkdir(parents=True, exist_ok=True)
+    manifest_file = out_dir / SITE_MANIFEST
+    try:
+        previous = json.loads(manifest_file.read_text())
+    except (OSError, ValueError):
+        previous = {}
+    summary = {"pages": 0, "unchanged": 0, "assets": 0, "removed": 0}
+    pages = {}
+    assets = set()
+
+    def asset(name, read):
+        """Copy an asset into the output folder unless it is already there; returns its URL"""
+        assets.add(name)
+        path = out_dir / SITE_ASSETS / name
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, read())
+            summary["assets"] += 1
+        return f"{SITE_ASSETS}/{name}"
+
+    def photo_asset(entry):
+        return asset(f"photos/{Path(entry['path']).name}", lambda: get_photo_bytes(entry))
+
+    def stale(name, *inputs):
+        """Whether a page must be written, i.e. its inputs changed since the last export or `full` is set"""
+        pages[name] = _site_fingerprint(css_url, *inputs)
+        if not full and previous.get("pages", {}).get(name) == pages[name] and (out_dir / name).exists():
+            summary["unchanged"] += 1
+            return False
+        summary["pages"] += 1
+        return True
+
+    css = (PORTFOLIO_CSS + SITE_CSS).encode("utf-8")
+    css_url = asset(f"site.{hashlib.sha256(css).hexdigest()[:16]}.css", lambda: css)
+
+    if stale("index.html", ABOUT_MARKDOWN, CONTACT_ITEMS):
+        about = render_description(ABOUT_MARKDOWN)
+        atomic_write(out_dir / "index.html", _site_document("👋 About Me", "index.html", about, css_url).encode("utf-8"))
+
+    storage = get_storage()
+    store = get_photo_store()
+    for prefix, heading, collection, section in SITE_SECTIONS:
+        records = storage.load(collection)
+        if collection == TIMELINE_EVENTS:
+            records = list(SortedTimeline(records))
+        photos = store.entries(section)
+        page_count = max(1, -(-len(records) // SITE_PAGE_SIZE))
+        for number in range(page_count):
+            chunk = records[number * SITE_PAGE_SIZE:(number + 1) * SITE_PAGE_SIZE]
+            photo_urls = []
+            for record in chunk:
+                entry = photos.get(record["id"])
+                if entry is None:
+                    photo_urls.append(None)
+                elif collection == TIMELINE_EVENTS:
+                    photo_urls.append((photo_asset(inline_variant(entry)), srcset(image_variants(entry), photo_asset)))
+                else:
+                    # Thumbnails are derived from the photo, so its hash and the size name them
+                    photo_urls.append(asset(
+                        f"thumbs/{entry['digest']}-{THUMBNAIL_SIZE[0]}.webp",
+                        lambda entry=entry: get_photo_bytes(get_thumbnail(entry) or entry)
+                    ))
+            name = site_page_name(prefix, number)
+            pagination = _site_pagination(prefix, number, page_count)
+            if not stale(name, heading, chunk, photo_urls, pagination):
+                continue
+            if collection == TIMELINE_EVENTS:
+                cards = [_site_event(record, url) for record, url in zip(chunk, photo_urls)]
+            else:
+                cards = [_site_project(section, record, url) for record, url in zip(chunk, photo_urls)]
+            body = "\n".join(cards) or "<p>Nothing here yet.</p>"
+            atomic_write(out_dir / name, _site_document(heading, name, body + pagination, css_url).encode("utf-8"))
+
+    # Remove pages and assets an earlier export wrote that are no longer used
+    for name in previous.get("pages", {}).keys() - pages.keys():
+        (out_dir / name).unlink(missing_ok=True)
+        summary["removed"] += 1
+    for name in set(previous.get("assets", [])) - assets:
+        (out_dir / SITE_ASSETS / name).unlink(missing_ok=True)
+        summary["removed"] += 1
+    atomic_write(manifest_file, json.dumps({"format": SITE_FORMAT, "pages": pages, "assets": sorted(assets)}, indent=2).encode("utf-8"))
+    return summary
+
+# Command line
+# `python streamlit_app.py export|import ARCHIVE` and `site DIRECTORY` work
+# on the data folder in the current directory without starting the UI.
+def run_cli(argv):
+    import argparse
+    parser = argparse.ArgumentParser(prog="streamlit_app.py", description="Work with the portfolio data without starting the app")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="write all records and photos to an archive")
+    export_parser.add_argument("archive", type=Path, help="archive file, e.g. portfolio.tar.gz")
+    import_parser = commands.add_parser("import", help="add the records and photos in an archive")
+    import_parser.add_argument("archive", type=Path, help="archive file, e.g. portfolio.tar.gz")
+    site_parser = commands.add_parser("site", help="render the portfolio as a static website")
+    site_parser.add_argument("directory", type=Path, help="output folder, e.g. site")
+    site_parser.add_argument("--full", action="store_true", help="rewrite every page, not only changed ones")
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        with open(args.archive, 'wb') as f:
+            records, photos = export_archive(f)
+        print(f"Exported {records} records and {photos} photos to {args.archive}")
+    elif args.command == "import":
+        try:
+            with open(args.archive, 'rb') as f:
+                summary = import_archive(f)
+        except (OSError, ValueError) as e:
+            parser.exit(1, f"Import failed: {e}\n")
+        print(f"Imported {summary['records']} records and {summary['photos']} photos; skipped {summary['skipped']} invalid records")
+    else:
+        summary = export_site(args.directory, full=args.full)
+        print(
+            f"Wrote {summary['pages']} pages and {summary['assets']} assets to {args.directory}; "
+            f"{summary['unchanged']} pages unchanged, {summary['removed']} files removed"
+        )
+    return 0
+
+if __name__ == "__main__" and get_script_run_ctx(suppress_warning=True) is None:
+    sys.exit(run_cli(sys.argv[1:]))
+
+# Initialize session state with persistent data
+# Every run compares the storage's per-collection versions with the ones
+# this session loaded, and reloads only the collections that changed, so
+# writes from other sessions and workers show up on the next interaction.
+# Each version is loaded from disk once per process and shared by all
+# sessions as a read-only snapshot; a session works on a shallow copy, and
+# edits replace records instead of changing them in place. The search index
+# of a new version is derived from the last one, re-indexing changed records.
+SESSION_COLLECTIONS = {
+    MILESTONE_PROJECTS: ("milestone_projects", load_milestone_projects, index_records, "milestone_photos", load_milestone_photos),
+    SMALL_PROJECTS: ("small_projects", load_small_projects, index_records, "small_photos", load_small_photos),
+    TIMELINE_EVENTS: ("timeline_events", load_timeline_events, SortedTimeline, "timeline_photos", load_timeline_photos)
+}
+
+@st.cache_resource(max_entries=2 * len(SESSION_COLLECTIONS), show_spinner=False)
+def get_collection_snapshot(collection, version):
+    _, load_records, build, _, _ = SESSION_COLLECTIONS[collection]
+    return build(load_records())
+
+@st.cache_resource(max_entries=2 * len(SESSION_COLLECTIONS), show_spinner=False)
+def get_photos_snapshot(collection, version):
+    _, _, _, _, load_photos = SESSION_COLLECTIONS[collection]
+    return load_photos()
+
+@st.cache_resource
+def get_search_bases():
+    """The latest search index built for each collection"""
+    return {}
+
+@st.cache_resource(max_entries=2 * len(SESSION_COLLECTIONS), show_spinner=False)
+def get_search_snapshot(collection, version):
+    """The search index for a collection version, updated from the previous one"""
+    records = get_collection_snapshot(collection, version)
+    base = get_search_bases().get(collection)
+    index = copy.copy(base) if base is not None else SearchIndex()
+    index.sync(records.values() if isinstance(records, dict) else records)
+    get_search_bases()[collection] = index
+    return index
+
+@timed("session.sync")
+def sync_session_data():
+    known = st.session_state.setdefault("data_versions", {})
+    for collection, version in get_storage().versions().items():
+        if known.get(collection) == version:
+            continue
+        records_key = SESSION_COLLECTIONS[collection][0]
+        st.session_state[records_key] = copy.copy(get_collection_snapshot(collection, version))
+        st.session_state.setdefault("search_indexes", {})[collection] = copy.copy(get_search_snapshot(collection, version))
+        known[collection] = version
+    # Photo manifests follow the photo store's own change counter
+    photos_version = get_photo_store().version()
+    if known.get("photos") != photos_version:
+        for collection, (_, _, _, photos_key, _) in SESSION_COLLECTIONS.items():
+            st.session_state[photos_key] = dict(get_photos_snapshot(collection, photos_version))
+        known["photos"] = photos_version
+
+def note_write(collection, version):
+    """Record this session's own write so it does not trigger a reload"""
+    known = st.session_state.data_versions
+    if known.get(collection) == version - 1:
+        known[collection] = version
+
+def handle_conflict(collection, message):
+    """Reload a collection after a stale write was rejected"""
+    st.session_state.data_versions.pop(collection, None)
+    st.session_state.storage_conflict = message
+    st.rerun()
+
+sync_session_data()
+
+if "storage_conflict" in st.session_state:
+    st.warning(st.session_state.pop("storage_conflict"))
+
+# Photo save functions
+# Photos are keyed by section ("milestone", "small" or "timeline") and
+# record id. Project photos also get a card thumbnail when they are saved.
+def _drop_photo_object(entry):
+    """Clear a photo object the store has deleted from caches and the static folder, with its thumbnail and variants"""
+    if entry is not None:
+        unpublish_photo(entry)
+        forget_photo(entry)
+        delete_thumbnail(entry)
+        delete_variants(entry)
+
+@timed("photo.save")
+def save_photo(section, photo_key, photo_data, file_extension):
+    """Save a record's photo to the photo store"""
+    entry, dropped = get_photo_store().put(section, photo_key, photo_data, file_extension)
+    _drop_photo_object(dropped)
+    get_photo_cache().put(_photo_cache_key(entry), photo_data)
+    if section != "timeline":
+        get_thumbnail(entry)
+    else:
+        image_variants(entry)
+    return entry
+
+@timed("photo.delete")
+def delete_photo(section, photo_key):
+    """Delete a record's photo from the photo store"""
+    _drop_photo_object(get_photo_store().remove(section, photo_key))
+
+# Upload limits
+# File uploaders refuse files over MAX_UPLOAD_MB in the browser. Photos are
+# also checked against the session's allowance and their magic bytes before
+# anything is written, then copied in chunks to UPLOADS_DIR; the workers read
+# them from there, so queued photos are not held in memory.
+MAX_UPLOAD_MB = max(1, int(os.environ.get("PORTFOLIO_MAX_UPLOAD_MB", "20")))
+SESSION_UPLOAD_MB = max(1, int(os.environ.get("PORTFOLIO_SESSION_UPLOAD_MB", "200")))
+MAX_TEXT_UPLOAD_MB = 1
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+UPLOAD_EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif", "image/webp": ".webp"}
+
+class UploadRejected(ValueError):
+    """An upload that is too large or not an accepted image"""
+
+def spool_upload(uploaded_file):
+    """Check an uploaded photo and copy it to UPLOADS_DIR in chunks; returns the copy's path"""
+    name = uploaded_file.name
+    if uploaded_file.size > MAX_UPLOAD_MB * 2**20:
+        raise UploadRejected(f"{name} is larger than {MAX_UPLOAD_MB} MB.")
+    used = st.session_state.get("upload_bytes", 0)
+    if used + uploaded_file.size > SESSION_UPLOAD_MB * 2**20:
+        raise UploadRejected(f"{name} was not saved: this session has used its {SESSION_UPLOAD_MB} MB of uploads.")
+    uploaded_file.seek(0)
+    head = uploaded_file.read(16)
+    extension = UPLOAD_EXTENSIONS.get(detect_image_mime(head))
+    if extension is None:
+        raise UploadRejected(f"{name} is not a JPEG, PNG, GIF or WebP image.")
+    fd, upload_path = tempfile.mkstemp(dir=UPLOADS_DIR, suffix=extension)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(head)
+        shutil.copyfileobj(uploaded_file, f, UPLOAD_CHUNK_BYTES)
+    st.session_state.upload_bytes = used + uploaded_file.size
+    return Path(upload_path)
+
+# Background photo processing
+# Uploads are handed to a small worker pool that auto-orients them, drops
+# their metadata and recompresses them to WebP at a capped size, so a form
+# submit returns at once. Cards show a placeholder until the photo is saved.
+IMAGE_WORKERS = max(1, int(os.environ.get("PORTFOLIO_IMAGE_WORKERS", "2")))
+MAX_PHOTO_DIMENSION = int(os.environ.get("PORTFOLIO_MAX_PHOTO_PX", "2048"))
+PHOTO_JOBS_KEPT = 256
+PHOTO_POLL_SECONDS = 1
+
+@st.cache_resource
+def get_image_pool():
+    return ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="photo")
+
+@st.cache_resource
+def get_photo_jobs():
+    # (section, photo key) -> Future of the saved photo's manifest entry
+    return OrderedDict()
+
+def optimize_photo(photo_path):
+    """Auto-orient, strip metadata and recompress a photo file; returns (bytes, extension)"""
+    from PIL import Image, ImageOps
+    with Image.open(photo_path) as img:
+        if getattr(img, "is_animated", False):
+            # Animations are kept as uploaded
+            return Path(photo_path).read_bytes(), Path(photo_path).suffix
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+        img.thumbnail((MAX_PHOTO_DIMENSION, MAX_PHOTO_DIMENSION), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        # Pillow only writes EXIF when asked to, so the output carries none
+        img.save(buffer, "WEBP", quality=85, method=4)
+    return buffer.getvalue(), ".webp"
+
+@timed("photo.process")
+def _process_photo(section, photo_key, photo_path):
+    photo_data, file_extension = optimize_photo(photo_path)
+    return save_photo(section, photo_key, photo_data, file_extension)
+
+def queue_photo(section, photo_key, uploaded_file):
+    """Process and save an uploaded photo in the background"""
+    try:
+        photo_path = spool_upload(uploaded_file)
+    except UploadRejected as e:
+        st.toast(f"⚠️ {e}")
+        return
+    jobs = get_photo_jobs()
+    jobs.pop((section, photo_key), None)
+    job = get_image_pool().submit(_process_photo, section, photo_key, photo_path)
+    # The spooled copy goes once the photo is saved, fails or is cancelled
+    job.add_done_callback(lambda _: photo_path.unlink(missing_ok=True))
+    jobs[(section, photo_key)] = job
+    # Forget the oldest finished jobs; sessions have picked them up by then
+    for job_key in list(islice(jobs, max(0, len(jobs) - PHOTO_JOBS_KEPT))):
+        if jobs[job_key].done():
+            del jobs[job_key]
+
+def discard_photo_job(section, photo_key):
+    """Cancel a queued photo for a deleted record"""
+    job = get_photo_jobs().pop((section, photo_key), None)
+    if job is not None and not job.cancel():
+        # Already processing: remove the photo once it lands
+        job.add_done_callback(lambda _: delete_photo(section, photo_key))
+
+def session_photo(section, photo_key):
+    """Return (manifest entry, still processing) for a record's photo"""
+    photos = st.session_state[f"{section}_photos"]
+    job = get_photo_jobs().get((section, photo_key))
+    if job is not None:
+        if not job.done():
+            return None, True
+        # Once saved, the photo store's version bump reloads every session's
+        # manifest, so the finished job is not needed any more
+        get_photo_jobs().pop((section, photo_key), None)
+        if job.exception() is None:
+            photos[photo_key] = job.result()
+        else:
+            st.toast("⚠️ A photo could not be processed and was not saved.")
+    return photos.get(photo_key), False
+
+# Rich Text Editor Helper
+def create_rich_text_editor(label, value="", key_prefix=""):
+    """Create a rich text editor with formatting options"""
+    st.markdown(f"**{label}**")
+    
+    # Create three tabs: Direct Input, File Upload, and Preview
+    tab1, tab2, tab3 = st.tabs(["✏️ Text Input", "📄 Upload File", "👁️ Preview"])
+    
+    with tab1:
+        # Text input with formatting guide
+        st.caption("💡 Formatting tips: Use **bold**, *italic*, - for bullets, 1. for numbers")
+        text_input = st.text_area(
+            label="Enter description (supports Markdown formatting)",
+            value=value,
+            height=200,
+            label_visibility="collapsed",
+            key=f"{key_prefix}_text_input"
+        )
+    
+    with tab2:
+        uploaded_text_file = st.file_uploader(
+            "Upload a .txt file",
+            type=["txt"],
+            max_upload_size=MAX_TEXT_UPLOAD_MB,
+            key=f"{key_prefix}_file_upload"
+        )
+        text_from_file = ""
+        if uploaded_text_file is not None:
             try:
-                release_date_obj = datetime.strptime(release_date_str, '%Y-%m-%d')
-                release_date_formatted = release_date_obj.strftime('%B %Y')
-            except:
-                release_date_formatted = release_date_str
+                text_from_file = uploaded_text_file.getvalue().decode("utf-8")
+                st.caption("✅ File loaded successfully")
+            except UnicodeDecodeError:
+                st.caption("⚠️ The file is not UTF-8 text and was ignored")
+    
+    with tab3:
+        # Show formatted preview
+        combined_text = text_from_file if text_from_file else text_input
+        st.markdown("### Preview")
+        if combined_text:
+            st.markdown(render_description(combined_text), unsafe_allow_html=True)
         else:
-            release_date_formatted = 'N/A'
+            st.markdown("*No content yet*")
+    
+    # Return the final text (prefer file input if available)
+    final_text = text_from_file if text_from_file else text_input
+    return final_text
+
+# Viewer mode
+# With PORTFOLIO_MODE=view the app is read-only. With PORTFOLIO_EDIT_TOKEN set,
+# only sessions opened with ?edit=<token> can edit, whatever the mode. A
+# read-only session never builds the add forms, uploaders, edit and delete
+# buttons or the import panel, so its reruns send a much smaller page.
+VIEW_MODE = os.environ.get("PORTFOLIO_MODE", "edit").lower() == "view"
+EDIT_TOKEN = os.environ.get("PORTFOLIO_EDIT_TOKEN", "")
+
+def editing_enabled():
+    """Whether this session may add, edit, delete and import records"""
+    if EDIT_TOKEN:
+        if not st.session_state.get("editor"):
+            given = st.query_params.get("edit", "")
+            st.session_state.editor = hmac.compare_digest(given.encode("utf-8"), EDIT_TOKEN.encode("utf-8"))
+        return st.session_state.editor
+    return not VIEW_MODE
+
+# Pagination Helpers
+# Each list only builds widgets for the current page of items.
+PAGE_SIZE = max(1, int(os.environ.get("PORTFOLIO_PAGE_SIZE", "10")))
+
+def page_bounds(section, total):
+    """Clamp the section's current page and return the (start, end) of its slice"""
+    page_count = max(1, -(-total // PAGE_SIZE))
+    page = min(st.session_state.get(f"{section}_page", 0), page_count - 1)
+    st.session_state[f"{section}_page"] = page
+    start = page * PAGE_SIZE
+    return start, min(start + PAGE_SIZE, total)
+
+def page_controls(section, total):
+    """Render previous/next buttons for a paginated section"""
+    page_count = max(1, -(-total // PAGE_SIZE))
+    if page_count <= 1:
+        return
+    page = st.session_state[f"{section}_page"]
+    col_prev, col_info, col_next = st.columns([0.15, 1, 0.15])
+    with col_prev:
+        if st.button("◀ Prev", key=f"{section}_prev_page", disabled=page == 0):
+            st.session_state[f"{section}_page"] = page - 1
+            st.rerun()
+    with col_info:
+        st.caption(f"Page {page + 1} of {page_count} · {total} items")
+    with col_next:
+        if st.button("Next ▶", key=f"{section}_next_page", disabled=page >= page_count - 1):
+            st.session_state[f"{section}_page"] = page + 1
+            st.rerun()
+
+def reset_pages():
+    """Go back to the first page of every list, e.g. when the search changes"""
+    for section in ("milestone", "small", "timeline"):
+        st.session_state.pop(f"{section}_page", None)
+
+# Search Helpers
+# The search box and technology filter narrow all three lists through the
+# session's search indexes, and only the matching records are rendered.
+def technology_facets():
+    """{technology key: (label, number of projects)} across both project lists"""
+    facets = {}
+    for collection in (MILESTONE_PROJECTS, SMALL_PROJECTS):
+        for key, (label, count) in st.session_state.search_indexes[collection].technologies().items():
+            label, total = facets.get(key, (label, 0))
+            facets[key] = (label, total + count)
+    return facets
+
+def search_active():
+    return bool(search_terms(st.session_state.get("search_query", "")) or st.session_state.get("search_technologies"))
+
+@timed("search.query")
+def search_matches(collection):
+    """Ids of the records matching the search, or None when nothing is searched"""
+    words = search_terms(st.session_state.get("search_query", ""))
+    technologies = st.session_state.get("search_technologies", [])
+    if not words and not technologies:
+        return None
+    if collection == TIMELINE_EVENTS:
+        # Events have no technology tags; a technology matches events that mention it
+        for technology in technologies:
+            words |= search_terms(technology)
+        technologies = []
+    index = st.session_state.search_indexes[collection]
+    if words and not index.has_words:
+        # Build the words once per process, on the shared index for this version
+        snapshot = get_search_snapshot(collection, st.session_state.data_versions[collection])
+        snapshot.index_words()
+        index = st.session_state.search_indexes[collection] = copy.copy(snapshot)
+    return index.search(words, technologies)
+
+def visible_records(collection, records):
+    """The records to list, in order: all of them, or those matching the search"""
+    matches = search_matches(collection)
+    if matches is None:
+        return records
+    return [record for record in records if record['id'] in matches]
+
+# History Helpers
+# A card's History button lists the record's earlier versions, rebuilt from
+# the history log. Restoring one saves its fields as a new version, so a
+# restore can itself be undone.
+def changed_fields(newer, older):
+    return [
+        field for field in dict.fromkeys([*newer, *older])
+        if field not in UNVERSIONED_FIELDS and newer.get(field) != older.get(field)
+    ]
+
+def history_panel(collection, record):
+    """List a record's earlier versions; returns the one picked for restoring, or None"""
+    versions = get_record_history().versions(collection, record["id"], get_storage().get(collection, record["id"]))
+    if not versions:
+        st.caption("No earlier versions saved.")
+        return None
+    picked = None
+    newer = record
+    for index, entry in enumerate(versions):
+        older = entry["record"]
+        col_text, col_button = st.columns([1, 0.3])
+        with col_text:
+            st.caption(
+                f"Version {entry['version']}, replaced {datetime.fromtimestamp(entry['saved_at']):%Y-%m-%d %H:%M} · "
+                f"differs in {', '.join(changed_fields(newer, older)) or 'nothing'}"
+            )
+        with col_button:
+            if st.button("Undo last change" if index == 0 else "Restore", key=f"restore_{collection}_{record['id']}_{entry['seq']}"):
+                picked = older
+        newer = older
+    return picked
+
+# Card Fragments
+# Each card and its edit form is a fragment, so Edit, Cancel and Save rerun
+# only that card. A full rerun happens only when a record is deleted or an
+# event moves to a different place in the timeline.
+def rerun_fragment():
+    """Rerun the calling fragment, or the whole app outside a fragment rerun"""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+@st.fragment(run_every=PHOTO_POLL_SECONDS)
+def await_photo(section, photo_key):
+    """Placeholder that reruns the app once a queued photo is saved"""
+    job = get_photo_jobs().get((section, photo_key))
+    if job is None or job.done():
+        st.rerun()
+    st.caption("⏳ Processing photo…")
+
+@st.fragment
+@timed("render.project_card")
+def render_project_card(section, project_key):
+    """Render one milestone or small project card with its edit form"""
+    config = PROJECT_SECTIONS[section]
+    editable = editing_enabled()
+    projects = st.session_state[f"{section}_projects"]
+    photos = st.session_state[f"{section}_photos"]
+    project = projects.get(project_key)
+    if project is None:
+        return
+    prefix = config["form_prefix"]
+    heading = config["heading"]
+
+    release_date_formatted = month_label(project.get('release_date', 'N/A'))
+    
+    # Read-only cards skip the button columns
+    col1, col2, col3 = st.columns([1, 0.15, 0.15]) if editable else (contextlib.nullcontext(), None, None)
+    
+    with col1:
+        # Display card with photo next to title if exists
+        photo_html = ""
+        photo_entry, photo_pending = session_photo(section, project_key)
+        if photo_pending:
+            photo_html = '<div style="height: 60px; width: 60px; border: 1px dashed #999; border-radius: 5px; margin-right: 10px; display: flex; align-items: center; justify-content: center;">⏳</div>'
+        elif photo_entry is not None:
+            thumb_entry = get_thumbnail(photo_entry)
+            photo_html = f'<img src="{photo_src(thumb_entry or photo_entry)}" style="height: 60px; width: 60px; object-fit: cover; border-radius: 5px; margin-right: 10px; vertical-align: middle;">'
         
-        col1, col2, col3 = st.columns([1, 0.15, 0.15])
+        st.markdown(f"""
+        <div class="project-card">
+            <div style="display: flex; align-items: center; margin-bottom: 10px;">
+                {photo_html}
+                <{heading} style="margin: 0;">{html.escape(project['title'])}</{heading}>
+            </div>
+            <p><strong>Released:</strong> {html.escape(str(release_date_formatted))}</p>
+            <p><strong>Technologies:</strong> {html.escape(', '.join(project['technologies']))}</p>
+        </div>
+        """, unsafe_allow_html=True)
         
-        with col1:
-            # Display card with photo next to title if exists
-            photo_html = ""
-            if project_key in st.session_state.milestone_photos:
-                photo_html = f'<img src="data:image/png;base64,{__import__("base64").b64encode(st.session_state.milestone_photos[project_key]).decode()}" style="height: 60px; width: 60px; object-fit: cover; border-radius: 5px; margin-right: 10px; vertical-align: middle;">'
-            
-            st.markdown(f"""
-            <div class="project-card">
-                <div style="display: flex; align-items: center; margin-bottom: 10px;">
-                    {photo_html}
-                    <h3 style="margin: 0;">{project['title']}</h3>
-                </div>
-                <p><strong>Released:</strong> {release_date_formatted}</p>
-                <p><strong>Technologies:</strong> {', '.join(project['technologies'])}</p>
+        # Display description and link inside a container
+        st.markdown(f"""
+        <div style="border: 2px solid #000; border-top: none; padding: 10px; margin-top: -2px;">
+            <div style="margin-bottom: 10px;">
+                {description_html(project)}
             </div>
-            """, unsafe_allow_html=True)
+            <a href="{html.escape(safe_url(project['link']))}" target="_blank" style="color: #0066cc; text-decoration: none; font-weight: bold;">{config["link_label"]}</a>
+        </div>
+        """, unsafe_allow_html=True)
+        if photo_pending:
+            await_photo(section, project_key)
+    if not editable:
+        return
+    
+    with col2:
+        if st.button("Edit", key=f"edit_{section}_{project_key}"):
+            st.session_state[f"editing_{section}_{project_key}"] = True
+            # Saves are checked against the version the form was opened on
+            st.session_state[f"edit_base_{section}_{project_key}"] = project.get("version", 0)
+        if st.button("History", key=f"history_{section}_{project_key}"):
+            showing = f"showing_history_{section}_{project_key}"
+            st.session_state[showing] = not st.session_state.get(showing, False)
+    
+    with col3:
+        if st.button("Delete", key=f"delete_{section}_{project_key}"):
+            storage = get_storage()
+            try:
+                note_write(config["collection"], storage.delete(config["collection"], project_key, project.get("version", 0)))
+            except storage.Conflict:
+                handle_conflict(config["collection"], "This project was changed in another session and was not deleted. Showing the latest version.")
+            # Remove photo if exists
+            discard_photo_job(section, project_key)
+            if project_key in photos:
+                delete_photo(section, project_key)
+                del photos[project_key]
+            del projects[project_key]
+            st.session_state.search_indexes[config["collection"]].remove(project_key)
+            # The list and its pages change shape, so rerun the whole app
+            st.rerun()
+    
+    # Edit form
+    if st.session_state.get(f"editing_{section}_{project_key}", False):
+        with st.form(f"edit_{section}_form_{project_key}"):
+            new_title = st.text_input("Project Title", value=project['title'], key=f"edit_{prefix}_title_{project_key}")
+            try:
+                old_release_date = datetime.strptime(project.get('release_date', ''), '%Y-%m-%d').date()
+            except:
+                old_release_date = datetime.now().date()
+            new_release_date = st.date_input("Release Date", value=old_release_date, key=f"edit_{prefix}_release_date_{project_key}")
+            new_description = create_rich_text_editor("Project Description", value=project['description'], key_prefix=f"edit_{section}_desc_{project_key}")
+            new_technologies = st.text_input("Technologies (comma-separated)", value=', '.join(project['technologies']), key=f"edit_{prefix}_tech_{project_key}")
+            new_link = st.text_input("Project Link", value=project['link'], key=f"edit_{prefix}_link_{project_key}")
+            new_photo = st.file_uploader("Update photo", type=["jpg", "jpeg", "png", "gif"], max_upload_size=MAX_UPLOAD_MB, key=f"edit_{prefix}_photo_{project_key}")
             
-            # Display description and link inside a container
-            st.markdown(f"""
-            <div style="border: 2px solid #000; border-top: none; padding: 10px; margin-top: -2px;">
-                <div style="margin-bottom: 10px;">
-                    {project['description']}
-                </div>
-                <a href="{project['link']}" target="_blank" style="color: #0066cc; text-decoration: none; font-weight: bold;">🔗 View Project</a>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            if st.button("Edit", key=f"edit_milestone_{idx}"):
-                st.session_state[f"editing_milestone_{idx}"] = True
-        
-        with col3:
-            if st.button("Delete", key=f"delete_milestone_{idx}"):
-                # Remove photo if exists
-                if project_key in st.session_state.milestone_photos:
-                    delete_milestone_photo(project_key)
-                    del st.session_state.milestone_photos[project_key]
-                st.session_state.milestone_projects.pop(idx)
-                save_milestone_projects()
-                st.rerun()
+            col_save, col_cancel = st.columns(2)
+            
+            with col_save:
+                if st.form_submit_button("Save Changes", key=f"save_edit_{prefix}_{project_key}"):
+                    updated_project = {
+                        "id": project_key,
+                        "title": new_title,
+                        "release_date": new_release_date.strftime('%Y-%m-%d'),
+                        "description": new_description,
+                        "technologies": [tech.strip() for tech in new_technologies.split(',') if tech.strip()],
+                        "link": new_link,
+                        "version": st.session_state.get(f"edit_base_{section}_{project_key}", project.get("version", 0))
+                    }
+                    compile_description(updated_project)
+                    storage = get_storage()
+                    try:
+                        note_write(config["collection"], storage.update(config["collection"], updated_project))
+                    except storage.Conflict:
+                        st.session_state[f"editing_{section}_{project_key}"] = False
+                        handle_conflict(config["collection"], "This project was changed in another session, so your edit was not saved. Showing the latest version.")
+                    projects[project_key] = updated_project
+                    st.session_state.search_indexes[config["collection"]].add(updated_project)
+                    
+                    # Update photo; the photo is keyed by the project id, so renames keep it
+                    if new_photo:
+                        queue_photo(section, project_key, new_photo)
+                    
+                    st.session_state[f"editing_{section}_{project_key}"] = False
+                    rerun_fragment()
+            
+            with col_cancel:
+                if st.form_submit_button("Cancel", key=f"cancel_edit_{prefix}_{project_key}"):
+                    st.session_state[f"editing_{section}_{project_key}"] = False
+                    rerun_fragment()
+    
+    # Version history
+    if st.session_state.get(f"showing_history_{section}_{project_key}", False):
+        restored = history_panel(config["collection"], project)
+        if restored is not None:
+            restored_project = dict(restored, version=project.get("version", 0))
+            compile_description(restored_project)
+            storage = get_storage()
+            try:
+                note_write(config["collection"], storage.update(config["collection"], restored_project))
+            except storage.Conflict:
+                handle_conflict(config["collection"], "This project was changed in another session, so the old version was not restored. Showing the latest version.")
+            projects[project_key] = restored_project
+            st.session_state.search_indexes[config["collection"]].add(restored_project)
+            rerun_fragment()
+
+@st.fragment
+@timed("render.timeline_item")
+def render_timeline_item(event_key):
+    """Render one timeline event with its edit form"""
+    timeline = st.session_state.timeline_events
+    event = timeline.get(event_key)
+    if event is None:
+        return
+    formatted_date = month_label(event['date'])
+    editable = editing_enabled()
+    
+    # Read-only items skip the button columns
+    col1, col2, col3 = st.columns([1, 0.15, 0.15]) if editable else (contextlib.nullcontext(), None, None)
+    
+    with col1:
+        st.markdown(f"""
+        <div class="timeline-item">
+            <div class="timeline-date">{html.escape(formatted_date)}</div>
+            <h4>{html.escape(event['title'])}</h4>
+            <div>{description_html(event)}</div>
+        </div>
+        """, unsafe_allow_html=True)
         
-        # Edit form
-        if st.session_state.get(f"editing_milestone_{idx}", False):
-            with st.form(f"edit_milestone_form_{idx}"):
-                new_title = st.text_input("Project Title", value=project['title'], key=f"edit_m_title_{idx}")
-                try:
-                    old_release_date = datetime.strptime(project.get('release_date', ''), '%Y-%m-%d').date()
-                except:
-                    old_release_date = datetime.now().date()
-                new_release_date = st.date_input("Release Date", value=old_release_date, key=f"edit_m_release_date_{idx}")
-                new_description = create_rich_text_editor("Project Description", value=project['description'], key_prefix=f"edit_milestone_desc_{idx}")
-                new_technologies = st.text_input("Technologies (comma-separated)", value=', '.join(project['technologies']), key=f"edit_m_tech_{idx}")
-                new_link = st.text_input("Project Link", value=project['link'], key=f"edit_m_link_{idx}")
-                new_photo = st.file_uploader("Update photo", type=["jpg", "jpeg", "png", "gif"], key=f"edit_m_photo_{idx}")
-                
-                col_save, col_cancel = st.columns(2)
-                
-                with col_save:
-                    if st.form_submit_button("Save Changes", key=f"save_edit_m_{idx}"):
-                        # Find and update the project
-                        for i, p in enumerate(st.session_state.milestone_projects):
-                            if p['title'] == project['title']:
-                                st.session_state.milestone_projects[i] = {
-                                    "title": new_title,
-                                    "release_date": new_release_date.strftime('%Y-%m-%d'),
-                                    "description": new_description,
-                                    "technologies": [tech.strip() for tech in new_technologies.split(',') if tech.strip()],
-                                    "link": new_link
-                                }
-                                break
-                        save_milestone_projects()
-                        
-                        # Update photo
-                        if new_photo:
-                            file_ext = Path(new_photo.name).suffix
-                            photo_data = new_photo.getvalue()
-                            # Delete old photo if title changed
-                            if project_key != new_title and project_key in st.session_state.milestone_photos:
-                                delete_milestone_photo(project_key)
-                                del st.session_state.milestone_photos[project_key]
-                            st.session_state.milestone_photos[new_title] = photo_data
-                            save_milestone_photo(new_title, photo_data, file_ext)
-                        elif project_key != new_title and project_key in st.session_state.milestone_photos:
-                            # Rename photo key if title changed
-                            photo_data = st.session_state.milestone_photos.pop(project_key)
-                            for ext in ['.jpg', '.jpeg', '.png', '.gif']:
-                                old_photo = MILESTONE_PHOTOS_DIR / f"{project_key}{ext}"
-                                if old_photo.exists():
-                                    photo_data = old_photo.read_bytes()
-                                    delete_milestone_photo(project_key)
-                                    save_milestone_photo(new_title, photo_data, ext)
-                                    st.session_state.milestone_photos[new_title] = photo_data
-                                    break
-                        
-                        st.session_state[f"editing_milestone_{idx}"] = False
-                        st.success("Project updated!")
-                        st.rerun()
-                
-                with col_cancel:
-                    if st.form_submit_button("Cancel", key=f"cancel_edit_m_{idx}"):
-                        st.session_state[f"editing_milestone_{idx}"] = False
+        # Display photo if exists
+        photo_entry, photo_pending = session_photo("timeline", event_key)
+        if photo_pending:
+            await_photo("timeline", event_key)
+        elif photo_entry is not None:
+            if PHOTO_MODE == "static":
+                variants = image_variants(photo_entry)
+                candidates = f' srcset="{srcset(variants, publish_photo)}" sizes="{TIMELINE_SIZES}"' if variants else ""
+                st.markdown(
+                    f'<img src="{publish_photo(inline_variant(photo_entry))}"{candidates} alt="" loading="lazy" style="width: 100%; height: auto;">',
+                    unsafe_allow_html=True
+                )
+            else:
+                st.image(get_photo_bytes(inline_variant(photo_entry)), width="stretch")
+    if not editable:
+        return
+    
+    with col2:
+        if st.button("Edit", key=f"edit_{event_key}"):
+            st.session_state[f"editing_{event_key}"] = True
+            # Saves are checked against the version the form was opened on
+            st.session_state[f"edit_base_{event_key}"] = event.get("version", 0)
+        if st.button("History", key=f"history_{event_key}"):
+            showing = f"showing_history_{event_key}"
+            st.session_state[showing] = not st.session_state.get(showing, False)
+    
+    with col3:
+        if st.button("Delete", key=f"delete_{event_key}"):
+            storage = get_storage()
+            try:
+                note_write(TIMELINE_EVENTS, storage.delete(TIMELINE_EVENTS, event_key, event.get("version", 0)))
+            except storage.Conflict:
+                handle_conflict(TIMELINE_EVENTS, "This event was changed in another session and was not deleted. Showing the latest version.")
+            # Remove photo if exists
+            discard_photo_job("timeline", event_key)
+            if event_key in st.session_state.timeline_photos:
+                delete_photo("timeline", event_key)
+                del st.session_state.timeline_photos[event_key]
+            timeline.remove(event_key)
+            st.session_state.search_indexes[TIMELINE_EVENTS].remove(event_key)
+            st.rerun()
+    
+    # Edit form
+    if st.session_state.get(f"editing_{event_key}", False):
+        with st.form(f"edit_timeline_form_{event_key}"):
+            new_date = st.date_input("Event Date", value=datetime.strptime(event['date'], '%Y-%m-%d').date(), key=f"edit_date_{event_key}")
+            new_title = st.text_input("Event Title", value=event['title'], key=f"edit_title_{event_key}")
+            new_description = st.text_area("Event Description", value=event['description'], key=f"edit_desc_{event_key}")
+            new_photo = st.file_uploader("Update photo", type=["jpg", "jpeg", "png", "gif"], max_upload_size=MAX_UPLOAD_MB, key=f"edit_photo_{event_key}")
+            
+            col_save, col_cancel = st.columns(2)
+            
+            with col_save:
+                if st.form_submit_button("Save Changes", key=f"save_edit_{event_key}"):
+                    updated_event = {
+                        "id": event_key,
+                        "date": new_date.strftime('%Y-%m-%d'),
+                        "title": new_title,
+                        "description": new_description,
+                        "version": st.session_state.get(f"edit_base_{event_key}", event.get("version", 0))
+                    }
+                    compile_description(updated_event)
+                    storage = get_storage()
+                    try:
+                        note_write(TIMELINE_EVENTS, storage.update(TIMELINE_EVENTS, updated_event))
+                    except storage.Conflict:
+                        st.session_state[f"editing_{event_key}"] = False
+                        handle_conflict(TIMELINE_EVENTS, "This event was changed in another session, so your edit was not saved. Showing the latest version.")
+                    timeline.update(updated_event)
+                    st.session_state.search_indexes[TIMELINE_EVENTS].add(updated_event)
+                    
+                    # Update photo; the photo is keyed by the event id, so edits keep it
+                    if new_photo:
+                        queue_photo("timeline", event_key, new_photo)
+                    
+                    st.session_state[f"editing_{event_key}"] = False
+                    # A new date moves the event within the timeline
+                    if updated_event['date'] != event['date']:
                         st.rerun()
+                    rerun_fragment()
+            
+            with col_cancel:
+                if st.form_submit_button("Cancel", key=f"cancel_edit_{event_key}"):
+                    st.session_state[f"editing_{event_key}"] = False
+                    rerun_fragment()
+    
+    # Version history
+    if st.session_state.get(f"showing_history_{event_key}", False):
+        restored = history_panel(TIMELINE_EVENTS, event)
+        if restored is not None:
+            restored_event = dict(restored, version=event.get("version", 0))
+            compile_description(restored_event)
+            storage = get_storage()
+            try:
+                note_write(TIMELINE_EVENTS, storage.update(TIMELINE_EVENTS, restored_event))
+            except storage.Conflict:
+                handle_conflict(TIMELINE_EVENTS, "This event was changed in another session, so the old version was not restored. Showing the latest version.")
+            timeline.update(restored_event)
+            st.session_state.search_indexes[TIMELINE_EVENTS].add(restored_event)
+            if restored_event['date'] != event['date']:
+                st.rerun()
+            rerun_fragment()
+
+# Custom CSS - Retro Macintosh Minimalistic Style
+st.markdown(f"<style>{PORTFOLIO_CSS}</style>", unsafe_allow_html=True)
+
+# Editing widgets are only built for sessions that may edit
+editable = editing_enabled()
+
+# Main header
+st.markdown(f'<div class="main-header">{SITE_TITLE}</div>', unsafe_allow_html=True)
+
+# About section
+st.markdown('<div class="section-header">👋 About Me</div>', unsafe_allow_html=True)
+st.write(ABOUT_MARKDOWN)
+
+# Search
+facets = technology_facets()
+col_query, col_technologies = st.columns([2, 1])
+with col_query:
+    st.text_input("🔍 Search", key="search_query", placeholder="Titles, descriptions and technologies", on_change=reset_pages)
+with col_technologies:
+    # Selected technologies stay listed even if their last project is deleted
+    options = facets.keys() | set(st.session_state.get("search_technologies", []))
+    st.multiselect(
+        "Technologies", sorted(options, key=lambda key: facets.get(key, (key,))[0].casefold()),
+        format_func=lambda key: f"{facets[key][0]} ({facets[key][1]})" if key in facets else key,
+        key="search_technologies", on_change=reset_pages
+    )
+searching = search_active()
+
+# Milestone Projects section
+st.markdown('<div class="section-header">Projects</div>', unsafe_allow_html=True)
+
+# Form to add milestone projects
+if editable:
+    with st.expander("+ Add Project"):
+        with st.form("milestone_form"):
+            title = st.text_input("Project Title")
+            release_date = st.date_input("Release Date", value=datetime.now().date())
+            description = create_rich_text_editor("Project Description", key_prefix="milestone_desc")
+            technologies = st.text_input("Technologies (comma-separated)")
+            link = st.text_input("Project Link")
+            image = st.file_uploader("Upload a photo", type=["jpg", "jpeg", "png", "gif"], max_upload_size=MAX_UPLOAD_MB, key="milestone_photo")
+            submitted = st.form_submit_button("Add Project")
+
+            if submitted and title:
+                new_project = {
+                    "id": new_record_id(),
+                    "title": title,
+                    "release_date": release_date.strftime('%Y-%m-%d'),
+                    "description": description,
+                    "technologies": [tech.strip() for tech in technologies.split(',') if tech.strip()],
+                    "link": link
+                }
+                compile_description(new_project)
+                st.session_state.milestone_projects[new_project["id"]] = new_project
+                st.session_state.search_indexes[MILESTONE_PROJECTS].add(new_project)
+                note_write(MILESTONE_PROJECTS, get_storage().insert(MILESTONE_PROJECTS, new_project))
+            
+                # Store photo if uploaded; it is processed in the background
+                if image:
+                    queue_photo("milestone", new_project["id"], image)
+            
+                st.success("Project added successfully!")
+
+# Display milestone projects
+milestone_projects = visible_records(MILESTONE_PROJECTS, st.session_state.milestone_projects.values())
+if milestone_projects:
+    start, end = page_bounds("milestone", len(milestone_projects))
+    with span("section.milestone"):
+        for project in islice(milestone_projects, start, end):
+            render_project_card("milestone", project['id'])
+    page_controls("milestone", len(milestone_projects))
+elif searching:
+    st.info("No milestone projects match your search.")
 else:
-    st.info("No milestone projects added yet. Use the form above to add your first project!")
+    st.info(f"No milestone projects added yet.{' Use the form above to add your first project!' if editable else ''}")
 
 # Fundamental Projects section
 st.markdown('<div class="section-header">Fundamental Projects</div>', unsafe_allow_html=True)
 
 # Form to add small projects
-with st.expander("+ Add Fundamental Project"):
-    with st.form("small_form"):
-        title = st.text_input("Project Title", key="small_title")
-        release_date = st.date_input("Release Date", value=datetime.now().date(), key="small_release_date")
-        description = create_rich_text_editor("Project Description", key_prefix="small_desc")
-        technologies = st.text_input("Technologies (comma-separated)", key="small_tech")
-        link = st.text_input("Project Link", key="small_link")
-        image = st.file_uploader("Upload a photo", type=["jpg", "jpeg", "png", "gif"], key="small_photo")
-        submitted = st.form_submit_button("Add Project", key="small_submit")
-
-        if submitted and title:
-            new_project = {
-                "title": title,
-                "release_date": release_date.strftime('%Y-%m-%d'),
-                "description": description,
-                "technologies": [tech.strip() for tech in technologies.split(',') if tech.strip()],
-                "link": link
-            }
-            st.session_state.small_projects.append(new_project)
-            save_small_projects()
+if editable:
+    with st.expander("+ Add Fundamental Project"):
+        with st.form("small_form"):
+            title = st.text_input("Project Title", key="small_title")
+            release_date = st.date_input("Release Date", value=datetime.now().date(), key="small_release_date")
+            description = create_rich_text_editor("Project Description", key_prefix="small_desc")
+            technologies = st.text_input("Technologies (comma-separated)", key="small_tech")
+            link = st.text_input("Project Link", key="small_link")
+            image = st.file_uploader("Upload a photo", type=["jpg", "jpeg", "png", "gif"], max_upload_size=MAX_UPLOAD_MB, key="small_photo")
+            submitted = st.form_submit_button("Add Project", key="small_submit")
+
+            if submitted and title:
+                new_project = {
+                    "id": new_record_id(),
+                    "title": title,
+                    "release_date": release_date.strftime('%Y-%m-%d'),
+                    "description": description,
+                    "technologies": [tech.strip() for tech in technologies.split(',') if tech.strip()],
+                    "link": link
+                }
+                compile_description(new_project)
+                st.session_state.small_projects[new_project["id"]] = new_project
+                st.session_state.search_indexes[SMALL_PROJECTS].add(new_project)
+                note_write(SMALL_PROJECTS, get_storage().insert(SMALL_PROJECTS, new_project))
             
-            # Store photo if uploaded
-            if image:
-                project_key = title
-                file_ext = Path(image.name).suffix
-                photo_data = image.getvalue()
-                st.session_state.small_photos[project_key] = photo_data
-                save_small_photo(project_key, photo_data, file_ext)
+                # Store photo if uploaded; it is processed in the background
+                if image:
+                    queue_photo("small", new_project["id"], image)
             
-            st.success("Project added successfully!")
+                st.success("Project added successfully!")
 
 # Display small projects
-if st.session_state.small_projects:
-    for idx, project in enumerate(st.session_state.small_projects):
-        project_key = project['title']
-        release_date_str = project.get('release_date', 'N/A')
-        if release_date_str != 'N/A':
-            try:
-                release_date_obj = datetime.strptime(release_date_str, '%Y-%m-%d')
-                release_date_formatted = release_date_obj.strftime('%B %Y')
-            except:
-                release_date_formatted = release_date_str
-        else:
-            release_date_formatted = 'N/A'
-        
-        col1, col2, col3 = st.columns([1, 0.15, 0.15])
-        
-        with col1:
-            # Display card with photo next to title if exists
-            photo_html = ""
-            if project_key in st.session_state.small_photos:
-                photo_html = f'<img src="data:image/png;base64,{__import__("base64").b64encode(st.session_state.small_photos[project_key]).decode()}" style="height: 60px; width: 60px; object-fit: cover; border-radius: 5px; margin-right: 10px; vertical-align: middle;">'
-            
-            st.markdown(f"""
-            <div class="project-card">
-                <div style="display: flex; align-items: center; margin-bottom: 10px;">
-                    {photo_html}
-                    <h4 style="margin: 0;">{project['title']}</h4>
-                </div>
-                <p><strong>Released:</strong> {release_date_formatted}</p>
-                <p><strong>Technologies:</strong> {', '.join(project['technologies'])}</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Display description and link inside a container
-            st.markdown(f"""
-            <div style="border: 2px solid #000; border-top: none; padding: 10px; margin-top: -2px;">
-                <div style="margin-bottom: 10px;">
-                    {project['description']}
-                </div>
-                <a href="{project['link']}" target="_blank" style="color: #0066cc; text-decoration: none; font-weight: bold;">🔗 View Code</a>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            if st.button("Edit", key=f"edit_small_{idx}"):
-                st.session_state[f"editing_small_{idx}"] = True
-        
-        with col3:
-            if st.button("Delete", key=f"delete_small_{idx}"):
-                # Remove photo if exists
-                if project_key in st.session_state.small_photos:
-                    delete_small_photo(project_key)
-                    del st.session_state.small_photos[project_key]
-                st.session_state.small_projects.pop(idx)
-                save_small_projects()
-                st.rerun()
-        
-        # Edit form
-        if st.session_state.get(f"editing_small_{idx}", False):
-            with st.form(f"edit_small_form_{idx}"):
-                new_title = st.text_input("Project Title", value=project['title'], key=f"edit_s_title_{idx}")
-                try:
-                    old_release_date = datetime.strptime(project.get('release_date', ''), '%Y-%m-%d').date()
-                except:
-                    old_release_date = datetime.now().date()
-                new_release_date = st.date_input("Release Date", value=old_release_date, key=f"edit_s_release_date_{idx}")
-                new_description = create_rich_text_editor("Project Description", value=project['description'], key_prefix=f"edit_small_desc_{idx}")
-                new_technologies = st.text_input("Technologies (comma-separated)", value=', '.join(project['technologies']), key=f"edit_s_tech_{idx}")
-                new_link = st.text_input("Project Link", value=project['link'], key=f"edit_s_link_{idx}")
-                new_photo = st.file_uploader("Update photo", type=["jpg", "jpeg", "png", "gif"], key=f"edit_s_photo_{idx}")
-                
-                col_save, col_cancel = st.columns(2)
-                
-                with col_save:
-                    if st.form_submit_button("Save Changes", key=f"save_edit_s_{idx}"):
-                        # Find and update the project
-                        for i, p in enumerate(st.session_state.small_projects):
-                            if p['title'] == project['title']:
-                                st.session_state.small_projects[i] = {
-                                    "title": new_title,
-                                    "release_date": new_release_date.strftime('%Y-%m-%d'),
-                                    "description": new_description,
-                                    "technologies": [tech.strip() for tech in new_technologies.split(',') if tech.strip()],
-                                    "link": new_link
-                                }
-                                break
-                        save_small_projects()
-                        
-                        # Update photo
-                        if new_photo:
-                            file_ext = Path(new_photo.name).suffix
-                            photo_data = new_photo.getvalue()
-                            # Delete old photo if title changed
-                            if project_key != new_title and project_key in st.session_state.small_photos:
-                                delete_small_photo(project_key)
-                                del st.session_state.small_photos[project_key]
-                            st.session_state.small_photos[new_title] = photo_data
-                            save_small_photo(new_title, photo_data, file_ext)
-                        elif project_key != new_title and project_key in st.session_state.small_photos:
-                            # Rename photo key if title changed
-                            photo_data = st.session_state.small_photos.pop(project_key)
-                            for ext in ['.jpg', '.jpeg', '.png', '.gif']:
-                                old_photo = SMALL_PHOTOS_DIR / f"{project_key}{ext}"
-                                if old_photo.exists():
-                                    photo_data = old_photo.read_bytes()
-                                    delete_small_photo(project_key)
-                                    save_small_photo(new_title, photo_data, ext)
-                                    st.session_state.small_photos[new_title] = photo_data
-                                    break
-                        
-                        st.session_state[f"editing_small_{idx}"] = False
-                        st.success("Project updated!")
-                        st.rerun()
-                
-                with col_cancel:
-                    if st.form_submit_button("Cancel", key=f"cancel_edit_s_{idx}"):
-                        st.session_state[f"editing_small_{idx}"] = False
-                        st.rerun()
+small_projects = visible_records(SMALL_PROJECTS, st.session_state.small_projects.values())
+if small_projects:
+    start, end = page_bounds("small", len(small_projects))
+    with span("section.small"):
+        for project in islice(small_projects, start, end):
+            render_project_card("small", project['id'])
+    page_controls("small", len(small_projects))
+elif searching:
+    st.info("No small projects match your search.")
 else:
-    st.info("No small projects added yet. Use the form above to add your first project!")
+    st.info(f"No small projects added yet.{' Use the form above to add your first project!' if editable else ''}")
 
 # Learning Timeline section
 st.markdown('<div class="section-header">Learning Timeline</div>', unsafe_allow_html=True)
 
 # Form to add timeline events
-with st.expander("+ Add Timeline Event"):
-    with st.form("timeline_form"):
-        date = st.date_input("Event Date")
-        title = st.text_input("Event Title", key="timeline_title")
-        description = st.text_area("Event Description", key="timeline_desc")
-        uploaded_file = st.file_uploader("Upload a photo", type=["jpg", "jpeg", "png", "gif"], key="timeline_photo")
-        submitted = st.form_submit_button("Add Event", key="timeline_submit")
-
-        if submitted and title:
-            new_event = {
-                "date": date.strftime('%Y-%m-%d'),
-                "title": title,
-                "description": description
-            }
-            st.session_state.timeline_events.append(new_event)
-            save_timeline_events()
+if editable:
+    with st.expander("+ Add Timeline Event"):
+        with st.form("timeline_form"):
+            date = st.date_input("Event Date")
+            title = st.text_input("Event Title", key="timeline_title")
+            description = st.text_area("Event Description", key="timeline_desc")
+            uploaded_file = st.file_uploader("Upload a photo", type=["jpg", "jpeg", "png", "gif"], max_upload_size=MAX_UPLOAD_MB, key="timeline_photo")
+            submitted = st.form_submit_button("Add Event", key="timeline_submit")
+
+            if submitted and title:
+                new_event = {
+                    "id": new_record_id(),
+                    "date": date.strftime('%Y-%m-%d'),
+                    "title": title,
+                    "description": description
+                }
+                compile_description(new_event)
+                st.session_state.timeline_events.add(new_event)
+                st.session_state.search_indexes[TIMELINE_EVENTS].add(new_event)
+                note_write(TIMELINE_EVENTS, get_storage().insert(TIMELINE_EVENTS, new_event))
             
-            # Store photo if uploaded
-            if uploaded_file:
-                event_key = f"{date.strftime('%Y-%m-%d')}_{title}"
-                file_ext = Path(uploaded_file.name).suffix
-                photo_data = uploaded_file.getvalue()
-                st.session_state.timeline_photos[event_key] = photo_data
-                save_timeline_photo(event_key, photo_data, file_ext)
+                # Store photo if uploaded; it is processed in the background
+                if uploaded_file:
+                    queue_photo("timeline", new_event["id"], uploaded_file)
             
-            st.success("Event added successfully!")
+                st.success("Event added successfully!")
 
 # Display timeline events (sorted by date, most recent first)
-if st.session_state.timeline_events:
-    # Sort events by date
-    sorted_events = sorted(st.session_state.timeline_events, key=lambda x: x['date'], reverse=True)
-    for idx, event in enumerate(sorted_events):
-        date_obj = datetime.strptime(event['date'], '%Y-%m-%d')
-        formatted_date = date_obj.strftime('%B %Y')
-        event_key = f"{event['date']}_{event['title']}"
-        
-        col1, col2, col3 = st.columns([1, 0.15, 0.15])
-        
-        with col1:
-            st.markdown(f"""
-            <div class="timeline-item">
-                <div class="timeline-date">{formatted_date}</div>
-                <h4>{event['title']}</h4>
-                <p>{event['description']}</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Display photo if exists
-            if event_key in st.session_state.timeline_photos:
-                st.image(st.session_state.timeline_photos[event_key], use_column_width=True)
-        
-        with col2:
-            if st.button("Edit", key=f"edit_{idx}"):
-                st.session_state[f"editing_{idx}"] = True
-        
-        with col3:
-            if st.button("Delete", key=f"delete_{idx}"):
-                # Remove photo if exists
-                if event_key in st.session_state.timeline_photos:
-                    delete_timeline_photo(event_key)
-                    del st.session_state.timeline_photos[event_key]
-                st.session_state.timeline_events.pop(sorted_events.index(event))
-                save_timeline_events()
+# Events are kept newest first, so a page is a plain slice
+timeline = visible_records(TIMELINE_EVENTS, st.session_state.timeline_events)
+if timeline:
+    start, end = page_bounds("timeline", len(timeline))
+    with span("section.timeline"):
+        for event in timeline[start:end]:
+            render_timeline_item(event['id'])
+    page_controls("timeline", len(timeline))
+elif searching:
+    st.info("No timeline events match your search.")
+else:
+    st.info(f"No timeline events added yet.{' Use the form above to add your first learning milestone!' if editable else ''}")
+
+# Import and export
+# Whole-portfolio archives in the same format as the command line; imported
+# records are picked up by the next sync like any other session's changes.
+if editable:
+    with st.expander("⇅ Import / Export", expanded="archive_message" in st.session_state):
+        if "archive_message" in st.session_state:
+            st.success(st.session_state.pop("archive_message"))
+        if st.button("Prepare export", key="archive_export"):
+            archive = io.BytesIO()
+            records, photos = export_archive(archive)
+            st.download_button(
+                f"Download archive ({records} records, {photos} photos)", archive.getvalue(),
+                file_name=f"portfolio-{datetime.now():%Y%m%d}.tar.gz", mime="application/gzip", key="archive_download"
+            )
+        archive_file = st.file_uploader("Import an archive", type=["gz", "tgz", "tar"], key="archive_upload")
+        if archive_file is not None and st.button("Import", key="archive_import"):
+            try:
+                summary = import_archive(archive_file)
+            except ValueError as e:
+                st.error(f"Import failed: {e}")
+            else:
+                message = f"Imported {summary['records']} records and {summary['photos']} photos."
+                if summary["skipped"]:
+                    message += f" Skipped {summary['skipped']} invalid records."
+                st.session_state.archive_message = message
                 st.rerun()
-        
-        # Edit form
-        if st.session_state.get(f"editing_{idx}", False):
-            with st.form(f"edit_timeline_form_{idx}"):
-                new_date = st.date_input("Event Date", value=datetime.strptime(event['date'], '%Y-%m-%d').date(), key=f"edit_date_{idx}")
-                new_title = st.text_input("Event Title", value=event['title'], key=f"edit_title_{idx}")
-                new_description = st.text_area("Event Description", value=event['description'], key=f"edit_desc_{idx}")
-                new_photo = st.file_uploader("Update photo", type=["jpg", "jpeg", "png", "gif"], key=f"edit_photo_{idx}")
-                
-                col_save, col_cancel = st.columns(2)
-                
-                with col_save:
-                    if st.form_submit_button("Save Changes", key=f"save_edit_{idx}"):
-                        # Find and update the event
-                        for i, e in enumerate(st.session_state.timeline_events):
-                            if e['date'] == event['date'] and e['title'] == event['title']:
-                                st.session_state.timeline_events[i] = {
-                                    "date": new_date.strftime('%Y-%m-%d'),
-                                    "title": new_title,
-                                    "description": new_description
-                                }
-                                break
-                        save_timeline_events()
-                        
-                        # Update photo
-                        new_event_key = f"{new_date.strftime('%Y-%m-%d')}_{new_title}"
-                        if new_photo:
-                            file_ext = Path(new_photo.name).suffix
-                            photo_data = new_photo.getvalue()
-                            st.session_state.timeline_photos[new_event_key] = photo_data
-                            save_timeline_photo(new_event_key, photo_data, file_ext)
-                        elif event_key != new_event_key and event_key in st.session_state.timeline_photos:
-                            # Rename photo key if date or title changed
-                            photo_data = st.session_state.timeline_photos.pop(event_key)
-                            # Delete old photo and save with new key
-                            delete_timeline_photo(event_key)
-                            for ext in ['.jpg', '.jpeg', '.png', '.gif']:
-                                old_photo = PHOTOS_DIR / f"{event_key}{ext}"
-                                if old_photo.exists():
-                                    break
-                            # Find extension of old photo
-                            for ext in ['.jpg', '.jpeg', '.png', '.gif']:
-                                old_photo = PHOTOS_DIR / f"{event_key}{ext}"
-                                if old_photo.exists():
-                                    photo_data = old_photo.read_bytes()
-                                    delete_timeline_photo(event_key)
-                                    save_timeline_photo(new_event_key, photo_data, ext)
-                                    st.session_state.timeline_photos[new_event_key] = photo_data
-                                    break
-                        
-                        st.session_state[f"editing_{idx}"] = False
-                        st.success("Event updated!")
-                        st.rerun()
-                
-                with col_cancel:
-                    if st.form_submit_button("Cancel", key=f"cancel_edit_{idx}"):
-                        st.session_state[f"editing_{idx}"] = False
+
+# Recently deleted
+# Deleted records stay in the history log until the retention policy drops
+# them, and can be put back under their old id. Their photos are not kept.
+DELETED_LABELS = {
+    MILESTONE_PROJECTS: "Milestone project",
+    SMALL_PROJECTS: "Fundamental project",
+    TIMELINE_EVENTS: "Timeline event"
+}
+if editable and HISTORY_VERSIONS:
+    with st.expander("↶ Recently deleted"):
+        shown = False
+        for collection, label in DELETED_LABELS.items():
+            records = st.session_state[SESSION_COLLECTIONS[collection][0]]
+            for deleted_at, record in get_record_history().deleted(collection):
+                if records.get(record["id"]) is not None:
+                    continue
+                shown = True
+                col_text, col_button = st.columns([1, 0.2])
+                with col_text:
+                    st.write(f"{label}: **{record.get('title', '')}**, deleted {datetime.fromtimestamp(deleted_at):%Y-%m-%d %H:%M}")
+                with col_button:
+                    if st.button("Restore", key=f"undelete_{collection}_{record['id']}"):
+                        compile_description(record)
+                        version = get_storage().insert(collection, record, if_absent=True)
+                        if version is None:
+                            handle_conflict(collection, "This item was already restored in another session. Showing the latest version.")
+                        note_write(collection, version)
+                        if collection == TIMELINE_EVENTS:
+                            records.add(record)
+                        else:
+                            records[record["id"]] = record
+                        st.session_state.search_indexes[collection].add(record)
                         st.rerun()
-else:
-    st.info("No timeline events added yet. Use the form above to add your first learning milestone!")
+        if not shown:
+            st.caption("Nothing has been deleted recently.")
 
 # Footer
 st.markdown("---")
 st.markdown("### Contact")
-st.write("Reach out for collaborations or opportunities.")
-col1, col2, col3 = st.columns(3)
-with col1:
-    st.markdown("✉️ <span style='color: #666;'>Name:</span> Isaac Ng", unsafe_allow_html=True)
-with col2:
-    st.markdown("🖥️ <span style='color: #666;'>GitHub:</span> [Kgoing1](https://github.com/Kgoing1)", unsafe_allow_html=True)
-with col3:
-    st.markdown("🚀 <span style='color: #666;'>Focus:</span> ML/DL Learning", unsafe_allow_html=True)
+st.write(CONTACT_INTRO)
+for column, (icon, label, text, link) in zip(st.columns(len(CONTACT_ITEMS)), CONTACT_ITEMS):
+    with column:
+        st.markdown(f"{icon} <span style='color: #666;'>{label}:</span> {f'[{text}]({link})' if link else text}", unsafe_allow_html=True)
+
+# Metrics panel
+# Hidden unless metrics are enabled and the page is opened with ?metrics,
+# or ?metrics=<token> when PORTFOLIO_METRICS_TOKEN is set.
+if METRICS_ENABLED:
+    record_span("script.run", time.perf_counter() - RUN_STARTED)
+    if "metrics" in st.query_params and (
+        not METRICS_TOKEN or hmac.compare_digest(st.query_params["metrics"].encode("utf-8"), METRICS_TOKEN.encode("utf-8"))
+    ):
+        st.markdown("---")
+        st.markdown("### Metrics")
+        session_tab, process_tab = st.tabs(["This session", "Process"])
+        for scope, tab, metrics in (("session", session_tab, st.session_state.get("metrics", Metrics())),
+                                    ("process", process_tab, get_process_metrics())):
+            with tab:
+                rows = metrics.rows()
+                if rows:
+                    st.table(rows)
+                else:
+                    st.caption("No spans recorded yet.")
+                col_json, col_prometheus = st.columns(2)
+                with col_json:
+                    st.download_button("Download JSON", json.dumps(metrics.snapshot(), indent=2),
+                                       file_name=f"portfolio-metrics-{scope}.json", mime="application/json",
+                                       key=f"metrics_json_{scope}")
+                with col_prometheus:
+                    st.download_button("Download Prometheus text", metrics.prometheus(),
+                                       file_name=f"portfolio-metrics-{scope}.prom", mime="text/plain",
+                                       key=f"metrics_prometheus_{scope}")
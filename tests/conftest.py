@@ -0,0 +1,21 @@
+"""Shared fixtures: the app module, imported headlessly"""
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+APP_FILE = Path(__file__).resolve().parent.parent / "streamlit_app.py"
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    # Importing runs the app in bare mode, which sets up portfolio_data in the working directory
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("app"))
+    try:
+        spec = importlib.util.spec_from_file_location("portfolio_app", APP_FILE)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+    return module
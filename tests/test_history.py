@@ -0,0 +1,63 @@
+"""Record history deltas and the SQLite history log"""
+import json
+import random
+
+import pytest
+
+WORDS = "alpha beta gamma delta\n\n - **x** y z".split(" ")
+
+def test_text_delta_round_trips(app):
+    rng = random.Random(1)
+    for _ in range(500):
+        new = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 200)))
+        old = list(new)
+        for _ in range(rng.randint(0, 5)):
+            start = rng.randint(0, len(old))
+            old[start:start + rng.randint(0, 20)] = rng.choice(["", "new text ", "\n", "zz"])
+        old = "".join(old)
+        assert app.apply_text_delta(new, app.text_delta(new, old)) == old
+
+def test_small_edit_to_long_text_is_stored_as_a_small_diff(app):
+    old = " ".join(random.Random(2).choice(WORDS) for _ in range(20000))
+    new = old[:len(old) // 2] + "EDIT" + old[len(old) // 2 + 4:]
+    delta = app.record_delta({"description": new}, {"description": old})
+    assert list(delta) == ["diff"] and len(json.dumps(delta)) < 100
+    assert app.apply_record_delta({"description": new}, delta)["description"] == old
+
+def test_large_changed_span_is_stored_whole(app):
+    rng = random.Random(3)
+    old = " ".join(rng.choice(WORDS) for _ in range(5000))
+    new = "X" + old[1:-1] + "Y"
+    assert app.text_delta(new, old) is None
+    assert app.record_delta({"description": new}, {"description": old}) == {"set": {"description": old}}
+
+def test_versions_rebuild_edits_and_deletes(app, tmp_path):
+    history = app.RecordHistory(tmp_path / "history.db", keep=20, max_age_days=0)
+    versions = [{"id": "r", "title": f"T{i}", "description": "long text " * 50 + str(i), "version": i} for i in range(1, 4)]
+    for previous, current in zip(versions, versions[1:]):
+        history.compress(history.record(app.MILESTONE_PROJECTS, previous, current))
+    assert [v["record"]["title"] for v in history.versions(app.MILESTONE_PROJECTS, "r", versions[-1])] == ["T2", "T1"]
+    assert history.versions(app.MILESTONE_PROJECTS, "r", versions[-1])[-1]["record"]["description"] == versions[0]["description"]
+    history.record(app.MILESTONE_PROJECTS, versions[-1], None)
+    assert [record["title"] for _, record in history.deleted(app.MILESTONE_PROJECTS)] == ["T3"]
+    assert [v["record"]["title"] for v in history.versions(app.MILESTONE_PROJECTS, "r", None)] == ["T3", "T2", "T1"]
+
+def test_retention_keeps_the_newest_versions(app, tmp_path):
+    history = app.RecordHistory(tmp_path / "history.db", keep=2, max_age_days=0)
+    versions = [{"id": "r", "title": f"T{i}", "version": i} for i in range(5)]
+    for previous, current in zip(versions, versions[1:]):
+        history.record(app.SMALL_PROJECTS, previous, current)
+    assert [v["record"]["title"] for v in history.versions(app.SMALL_PROJECTS, "r", versions[-1])] == ["T3", "T2"]
+
+@pytest.mark.parametrize("backend", ["sqlite", "json"])
+def test_restoring_twice_inserts_once(app, tmp_path, backend):
+    def open_storage():
+        if backend == "sqlite":
+            return app.SqliteStorage(tmp_path / "portfolio.db", tmp_path / ".lock")
+        files = {collection: tmp_path / f"{collection}.json" for collection in app.LEGACY_JSON_FILES}
+        return app.JsonStorage(files, tmp_path / "journal.ndjson", tmp_path / ".lock", 100)
+    a, b = open_storage(), open_storage()
+    record = {"id": "r", "title": "T", "release_date": "2024-01-01", "description": "", "technologies": [], "link": ""}
+    assert a.insert(app.MILESTONE_PROJECTS, dict(record), if_absent=True) is not None
+    assert b.insert(app.MILESTONE_PROJECTS, dict(record), if_absent=True) is None
+    assert [r["id"] for r in open_storage().load(app.MILESTONE_PROJECTS)] == ["r"]
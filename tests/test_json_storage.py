@@ -0,0 +1,48 @@
+"""JSON storage shared by several workers on one data directory"""
+import json
+import uuid
+
+import pytest
+
+def open_storage(app, data_dir, compact_every=4):
+    files = {collection: data_dir / f"{collection}.json" for collection in app.LEGACY_JSON_FILES}
+    return app.JsonStorage(files, data_dir / "journal.ndjson", data_dir / ".lock", compact_every)
+
+def project(title):
+    return {"id": uuid.uuid4().hex, "title": title, "release_date": "2024-01-01", "description": "", "technologies": [], "link": ""}
+
+def titles(storage, app):
+    return sorted(record["title"] for record in storage.load(app.MILESTONE_PROJECTS))
+
+def test_idle_worker_sees_changes_across_compactions(app, tmp_path):
+    a = open_storage(app, tmp_path)
+    b = open_storage(app, tmp_path)
+    for i in range(16):
+        a.insert(app.MILESTONE_PROJECTS, project(f"a{i}"))
+    b.insert(app.MILESTONE_PROJECTS, project("b"))
+    expected = sorted([f"a{i}" for i in range(16)] + ["b"])
+    assert titles(b, app) == expected
+    assert titles(a, app) == expected
+    assert titles(open_storage(app, tmp_path), app) == expected
+
+def test_torn_line_is_dropped_without_losing_changes(app, tmp_path):
+    a = open_storage(app, tmp_path, compact_every=1000)
+    b = open_storage(app, tmp_path, compact_every=1000)
+    for i in range(3):
+        a.insert(app.MILESTONE_PROJECTS, project(f"kept{i}"))
+    with open(tmp_path / "journal.ndjson", "ab") as f:
+        f.write(b'{"op": "ins')
+    b.insert(app.MILESTONE_PROJECTS, project("after"))
+    assert titles(open_storage(app, tmp_path), app) == ["after", "kept0", "kept1", "kept2"]
+    assert all(json.loads(line) for line in (tmp_path / "journal.ndjson").read_bytes().splitlines())
+
+def test_unreadable_line_before_other_changes_is_not_compacted_away(app, tmp_path):
+    a = open_storage(app, tmp_path, compact_every=1000)
+    b = open_storage(app, tmp_path, compact_every=1000)
+    a.insert(app.MILESTONE_PROJECTS, project("first"))
+    second = {"op": "insert", "collection": app.MILESTONE_PROJECTS, "record": dict(project("second"), version=1)}
+    with open(tmp_path / "journal.ndjson", "ab") as f:
+        f.write(b"garbage\n" + json.dumps(second).encode("utf-8") + b"\n")
+    with pytest.raises(ValueError, match="unreadable line"):
+        b.insert(app.MILESTONE_PROJECTS, project("third"))
+    assert b"second" in (tmp_path / "journal.ndjson").read_bytes()